@@ -0,0 +1,45 @@
+import argparse
+import json
+import sys
+
+from benchmark.harness import compare, run_benchmark, save_run
+from benchmark.imports import check_import_budgets
+
+
+parser = argparse.ArgumentParser(description="Per-stage benchmark of the resume -> questions -> evaluation pipeline")
+parser.add_argument("--live", action="store_true", help="use the configured LLM providers instead of the offline fake")
+parser.add_argument("--pdf", nargs="*", default=None, help="PDF resumes to include in the read_resume stage")
+parser.add_argument("--baseline", help="earlier results file to compare against")
+parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown before flagging a regression")
+parser.add_argument("--out", default="bench_results", help="directory for the results file")
+parser.add_argument("--trace-heap", action="store_true",
+                    help="also record each stage's Python heap peak (tracing inflates the timings)")
+parser.add_argument("--import-budget", action="store_true",
+                    help="only check that pipeline modules import within budget without loading provider SDKs")
+args = parser.parse_args()
+
+if args.import_budget:
+    problems = check_import_budgets()
+    for problem in problems:
+        print(f"IMPORT BUDGET {problem}")
+    print("Import budgets OK" if not problems else f"{len(problems)} import budget problem(s)")
+    sys.exit(1 if problems else 0)
+
+run = run_benchmark(pdfs=args.pdf, offline=not args.live, trace_heap=args.trace_heap)
+path = save_run(run, args.out)
+
+print(f"{'stage':<20}{'items':>6}{'wall s':>10}{'cpu s':>10}{'+rss MB':>10}{'calls':>7}{'tokens':>9}")
+for stage in run.stages:
+    if stage.skipped:
+        print(f"{stage.stage:<20}  skipped: {stage.skipped}")
+        continue
+    print(f"{stage.stage:<20}{stage.items:>6}{stage.wall_time:>10.3f}{stage.cpu_time:>10.3f}"
+          f"{stage.rss_delta_mb:>10.1f}{stage.llm_calls:>7}{stage.input_tokens + stage.output_tokens:>9}")
+print(f"Results written to {path}")
+
+if args.baseline:
+    with open(args.baseline, 'r') as f:
+        regressions = compare(run.as_dict(), json.load(f), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    sys.exit(1 if regressions else 0)
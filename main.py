@@ -1,13 +1,33 @@
-from resume_extract.resume_reader import read_resume
-from resume_extract.main import chunk_resume , extract_info
+import argparse
+import json
 
+from pipeline.stages import DEFAULT_WORKERS, run_directory
 
-read_resume(["data/kr.pdf"])
 
+def parse_workers(values):
+    workers = {}
+    for value in values:
+        stage, _, count = value.partition("=")
+        if stage not in DEFAULT_WORKERS or not count.isdigit():
+            parser.error(f"--workers expects <stage>=<count> with a stage in {list(DEFAULT_WORKERS)}")
+        workers[stage] = int(count)
+    return workers
 
-chunk_resume("scratch/kr.md", "data/kr.json")
 
-res = extract_info('data1/mr.json')
+parser = argparse.ArgumentParser(description="Resume -> questions -> evaluation pipeline; only out-of-date stages re-run")
+parser.add_argument("resumes", help="directory of resumes (PDF, image, markdown or text)")
+parser.add_argument("--out", default="data/pipeline", help="directory for stage artifacts and the manifest")
+parser.add_argument("--answers", help="directory of <resume stem>.json answer files ({question: answer}) to evaluate")
+parser.add_argument("--until", nargs="*", help="only bring these stages (and what they need) up to date")
+parser.add_argument("--force", nargs="*", default=[], help="re-run these stages even if up to date")
+parser.add_argument("--workers", nargs="*", default=[], help="per-stage parallelism, e.g. extract=8 questions=8")
+args = parser.parse_args()
 
-print(res)
+report = run_directory(args.resumes, args.out, args.answers, args.until, args.force, parse_workers(args.workers))
 
+print(f"{'stage':<12}{'ran':>6}{'cached':>8}{'failed':>8}{'skipped':>9}{'seconds':>10}")
+for name, stage in report.stages.items():
+    print(f"{name:<12}{stage.ran:>6}{stage.cached:>8}{stage.failed:>8}{stage.skipped:>9}{stage.seconds:>10.2f}")
+print(f"Finished in {report.elapsed:.2f} seconds")
+with open(f"{args.out}/last_run.json", 'w') as f:
+    json.dump(report.as_dict(), f, indent=2)
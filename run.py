@@ -1,78 +1,212 @@
 import streamlit as st
 
-# Sample JSON data
-import json
+from pathlib import Path
 
-# Load your actual json_data here
-json_data = json.load(open("tt.json"))
+from resume_extract.candidate_store import CandidateStore, SKILL_KINDS
 
-st.set_page_config(page_title="AI Engineer Resume", layout="wide")
-st.title("📄 AI Engineer Resume")
+# Search results are ranked server-side; beyond this many only the best are paged through
+MAX_RESULTS = 5000
+# Rescan the resume directory for new or changed files at most this often (seconds)
+SYNC_INTERVAL = 10
+# Long lists inside one section are shown this many items at a time
+ITEMS_PER_PAGE = 10
 
-# === Work Experience ===
-if "work_experience" in json_data:
-    st.subheader("💼 Work Experience")
-    for exp in json_data["work_experience"]:
+st.set_page_config(page_title="Candidate Resumes", layout="wide")
+
+
+# === Cached data access ===
+# Streamlit re-runs this script on every interaction, so nothing here may
+# scale with the number of candidates: the store connection is shared,
+# directory scans are throttled, and query results and page records are
+# cached under the store version so any write invalidates them.
+
+@st.cache_resource
+def get_store(store_path):
+    return CandidateStore(store_path)
+
+
+@st.cache_data(ttl=SYNC_INTERVAL, show_spinner="Syncing resumes...")
+def sync_directory(store_path, directory):
+    """Ingest extract_info JSON files from ``directory`` that changed since they were last stored."""
+    paths = sorted(str(path) for path in Path(directory).glob("*.json"))
+    return get_store(store_path).sync_files(paths)
+
+
+@st.cache_data(max_entries=64)
+def matching_candidates(store_path, version, query, terms, match_all):
+    """Keys of candidates matching the full-text ``query`` and skill ``terms``, best matches first,
+    with the text snippet each search hit matched on. Keys are None when nothing filters."""
+    store = get_store(store_path)
+    keys, hits = None, {}
+    if query.strip():
+        hits = {hit["candidate_key"]: hit["snippet"] for hit in store.search(query, limit=MAX_RESULTS)}
+        keys = list(hits)
+    if terms:
+        with_terms = set(store.find_by_terms(terms, match_all=match_all))
+        keys = [key for key in keys if key in with_terms] if keys is not None else sorted(with_terms)
+    return keys, hits
+
+
+@st.cache_data(max_entries=256)
+def key_page(store_path, version, page_size, offset):
+    return get_store(store_path).keys(limit=page_size, offset=offset)
+
+
+@st.cache_data(max_entries=256)
+def load_page(store_path, version, keys):
+    return get_store(store_path).get_many(list(keys))
+
+
+@st.cache_data
+def skill_options(store_path, version):
+    return [term for term, _ in get_store(store_path).top_terms(limit=500)]
+
+
+# === Section renderers ===
+
+def technologies_line(technologies):
+    if technologies:
+        st.markdown("**Technologies:** " + ", ".join(f"`{tech}`" for tech in technologies))
+
+
+def paged(items, key):
+    """The slice of ``items`` for the page chosen in a small pager below the heading."""
+    pages = max(1, -(-len(items) // ITEMS_PER_PAGE))
+    page = st.number_input(f"Page (of {pages})", 1, pages, 1, key=key) if pages > 1 else 1
+    return items[(page - 1) * ITEMS_PER_PAGE:page * ITEMS_PER_PAGE]
+
+
+def render_work_experience(info, key):
+    for exp in paged(info.get("work_experience") or [], key):
         with st.container():
-            st.markdown(f"### **{exp.get('Title', 'N/A')}** at **{exp.get('Company', 'N/A')}**")
-            st.markdown(f"*{exp.get('Duration', 'N/A')}*")
-            for resp in exp.get("Responsibilities", []):
+            st.markdown(f"### **{exp.get('title') or 'N/A'}** at **{exp.get('company') or 'N/A'}**")
+            st.markdown(f"*{exp.get('duration') or 'N/A'}*")
+            responsibilities = exp.get("responsibilities") or []
+            for resp in [responsibilities] if isinstance(responsibilities, str) else responsibilities:
                 st.markdown(f"- {resp}")
-            for proj in exp.get("Projects", []):
-                with st.expander(f"📌 {proj.get('title', 'Project')}"):
-                    st.markdown(proj.get("description", ""))
-                    techs = proj.get("technologies", [])
-                    if techs:
-                        st.markdown("**Technologies:** " + ", ".join(f"`{tech}`" for tech in techs))
-
-# === Personal Projects ===
-if "projects" in json_data:
-    st.subheader("🧠 Personal Projects")
-    for proj in json_data["projects"]:
-        with st.expander(f"📍 {proj.get('title', 'Project')}"):
-            st.markdown(proj.get("description", ""))
-            techs = proj.get("technologies", [])
-            if techs:
-                st.markdown("**Technologies:** " + ", ".join(f"`{tech}`" for tech in techs))
-
-# === Skills ===
-if "skills" in json_data:
-    st.subheader("🛠 Skills")
+            for proj in exp.get("projects") or []:
+                st.markdown(f"📌 **{proj.get('title') or 'Project'}**")
+                st.markdown(proj.get("description") or "")
+                technologies_line(proj.get("technologies"))
+
+
+def render_projects(info, key):
+    for proj in paged(info.get("projects") or [], key):
+        st.markdown(f"#### 📍 {proj.get('title') or 'Project'}")
+        st.markdown(proj.get("description") or "")
+        technologies_line(proj.get("technologies"))
+
+
+def render_skills(info, key):
+    skills = info.get("skills") or {}
     col1, col2, col3 = st.columns(3)
     with col1:
         st.markdown("**Technical Skills**")
-        for skill in json_data["skills"].get("technical_skills", []):
+        for skill in skills.get("technical_skills") or []:
             st.markdown(f"- {skill}")
     with col2:
         st.markdown("**Soft Skills**")
-        for skill in json_data["skills"].get("soft_skills", []):
+        for skill in skills.get("soft_skills") or []:
+            st.markdown(f"- {skill}")
+        st.markdown("**Domain Skills**")
+        for skill in skills.get("domain_specific_skills") or []:
             st.markdown(f"- {skill}")
     with col3:
         st.markdown("**Languages & Tools**")
-        for lang in json_data["skills"].get("languages", []):
+        for lang in skills.get("languages") or []:
             st.markdown(f"- {lang}")
-        for tool in json_data["skills"].get("tools_and_platforms", []):
+        for tool in skills.get("tools_and_platforms") or []:
             st.markdown(f"- {tool}")
 
-# === Education ===
-if "education" in json_data:
-    st.subheader("🎓 Education")
-    for edu in json_data["education"]:
-        st.markdown(f"**{edu.get('institution', 'N/A')}**")
-        st.markdown(f"*{edu.get('degree', '')} ({edu.get('year', '')})*")
+
+def render_education(info, key):
+    for edu in info.get("education") or []:
+        st.markdown(f"**{edu.get('institution') or 'N/A'}**")
+        st.markdown(f"*{edu.get('degree') or ''} ({edu.get('year') or ''})*")
         st.markdown("---")
 
-# === Publications & Research ===
-if "publications_research" in json_data:
-    st.subheader("📚 Publications & Research")
-    for pub in json_data["publications_research"]:
-        with st.expander(f"🔖 {pub.get('title', 'Untitled')}"):
-            st.markdown(f"**Authors:** {', '.join(pub.get('authors', []))}")
-            st.markdown(f"**Published In:** {pub.get('publication_venue', 'N/A')} ({pub.get('year', '')})")
-            st.markdown(f"**Description:** {pub.get('description', '')}")
-            if "doi_or_link" in pub:
-                st.markdown(f"[DOI / Link]({pub['doi_or_link']})")
+
+def render_publications(info, key):
+    for pub in paged(info.get("publications_research") or [], key):
+        st.markdown(f"#### 🔖 {pub.get('title') or 'Untitled'}")
+        st.markdown(f"**Authors:** {', '.join(pub.get('authors') or [])}")
+        st.markdown(f"**Published In:** {pub.get('publication_venue') or 'N/A'} ({pub.get('year') or ''})")
+        st.markdown(f"**Description:** {pub.get('description') or ''}")
+        if pub.get("doi_or_link"):
+            st.markdown(f"[DOI / Link]({pub['doi_or_link']})")
+
+
+# (label, extract_info key, renderer); only the selected section is rendered
+SECTIONS = [
+    ("🛠 Skills", "skills", render_skills),
+    ("💼 Work Experience", "work_experience", render_work_experience),
+    ("🧠 Projects", "projects", render_projects),
+    ("🎓 Education", "education", render_education),
+    ("📚 Publications & Research", "publications_research", render_publications),
+]
+
+
+def section_size(info, field):
+    value = info.get(field)
+    if isinstance(value, dict):
+        return sum(len(value.get(kind) or []) for kind in SKILL_KINDS)
+    return len(value or [])
+
+
+# === Sidebar: source, search and filters ===
+with st.sidebar:
+    st.header("Candidates")
+    store_path = st.text_input("Candidate store", "data/candidates.sqlite")
+    directory = st.text_input("Resume directory (extract_info JSON, optional)", "data/extracted")
+    if directory and Path(directory).is_dir():
+        sync_directory(store_path, directory)
+
+    store = get_store(store_path)
+    version = store.version()
+    query = st.text_input("Search text", placeholder="e.g. distributed training")
+    terms = st.multiselect("Skills", skill_options(store_path, version))
+    match_all = st.toggle("Require all skills", value=True)
+    page_size = st.selectbox("Candidates per page", [10, 25, 50], index=1)
+
+st.title("📄 Candidate Resumes")
+
+keys, hits = matching_candidates(store_path, version, query, tuple(terms), match_all)
+total = version[0] if keys is None else len(keys)
+if not total:
+    st.info("No candidates match." if version[0] else "The store is empty; extract some resumes first.")
+    st.stop()
+
+pages = -(-total // page_size)
+capped = " (best matches only)" if total >= MAX_RESULTS else ""
+st.caption(f"{total} of {version[0]} candidates{capped}")
+# Keyed by the result size so a new search starts again from page 1
+page = st.number_input(f"Page (of {pages})", 1, pages, 1, key=f"candidate_page:{total}:{page_size}")
+offset = (page - 1) * page_size
+if keys is None:
+    page_keys = tuple(key_page(store_path, version, page_size, offset))
+else:
+    page_keys = tuple(keys[offset:offset + page_size])
+records = load_page(store_path, version, page_keys)
+
+st.dataframe(
+    [{"candidate": key, **{label: section_size(records.get(key, {}), field) for label, field, _ in SECTIONS},
+      **({"match": hits.get(key, "")} if hits else {})}
+     for key in page_keys],
+    hide_index=True,
+    use_container_width=True,
+)
+
+selected = st.selectbox("Candidate", page_keys)
+info = records.get(selected) or {}
+labels = [label for label, field, _ in SECTIONS if section_size(info, field)]
+if not labels:
+    st.warning("Nothing was extracted for this candidate.")
+    st.stop()
+choice = st.radio("Section", labels, horizontal=True, label_visibility="collapsed")
+label, field, render = next(section for section in SECTIONS if section[0] == choice)
+st.subheader(label)
+render(info, key=f"{selected}:{field}")
 
 # === Footer ===
 st.markdown("---")
-st.markdown("📌 *This resume was rendered using Streamlit.*")
+st.markdown("📌 *These resumes were rendered using Streamlit.*")
@@ -0,0 +1,221 @@
+import json
+import os
+import platform
+import resource
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+LLM_ROLES = ["chunking", "extraction", "questions", "evaluation"]
+
+# Metrics compared against a baseline; lower is better for all of them
+REGRESSION_METRICS = ["wall_time", "cpu_time", "llm_calls", "input_tokens", "output_tokens"]
+# Absolute change below which a metric is treated as noise (seconds for timings)
+NOISE_FLOOR = {"wall_time": 0.05, "cpu_time": 0.05}
+
+
+@dataclass
+class StageResult:
+    stage: str
+    items: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    # Peak RSS during the stage minus RSS when it started
+    rss_delta_mb: float = 0.0
+    # Only measured with trace_heap, since tracing slows the stage down several times
+    py_heap_peak_mb: Optional[float] = None
+    llm_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    skipped: Optional[str] = None
+
+
+@dataclass
+class BenchmarkRun:
+    started_at: float
+    offline: bool
+    environment: Dict[str, str]
+    stages: List[StageResult] = field(default_factory=list)
+
+    def as_dict(self) -> Dict:
+        return {
+            "started_at": self.started_at,
+            "offline": self.offline,
+            "environment": self.environment,
+            "stages": [asdict(stage) for stage in self.stages],
+        }
+
+
+def use_offline_llms(latency: float = 0.0):
+    """Point every pipeline stage at the fake provider. Must run before the pipeline is imported."""
+    for role in LLM_ROLES:
+        os.environ[f"INTERVIEWAGENT_LLM_{role.upper()}"] = "fake"
+    os.environ["INTERVIEWAGENT_FAKE_LATENCY"] = str(latency)
+    os.environ["INTERVIEWAGENT_LLM_CACHE"] = "0"
+
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return rss / (1024 * 1024) if platform.system() == "Darwin" else rss / 1024
+
+
+def _rss_mb() -> float:
+    """Current RSS; without /proc, the process high-water mark instead."""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / (1024 * 1024)
+    except OSError:
+        return _max_rss_mb()
+
+
+class _RSSSampler:
+    """Samples RSS on a background thread to find a stage's own peak.
+
+    ru_maxrss only ever grows over the process lifetime, so a later stage
+    would just inherit an earlier stage's peak.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.baseline = self.peak = _rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_mb())
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_mb())
+
+    @property
+    def delta_mb(self) -> float:
+        return self.peak - self.baseline
+
+
+@contextmanager
+def measure(stage: str, results: List[StageResult], trace_heap: bool = False):
+    from llms.usage import track_usage
+
+    result = StageResult(stage=stage)
+    if trace_heap:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    sampler = _RSSSampler()
+    sampler.start()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    with track_usage() as usage:
+        try:
+            yield result
+        finally:
+            result.wall_time = time.perf_counter() - wall_start
+            result.cpu_time = time.process_time() - cpu_start
+            if trace_heap:
+                result.py_heap_peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                tracemalloc.stop()
+            sampler.stop()
+            result.rss_delta_mb = sampler.delta_mb
+            result.llm_calls = usage.calls
+            result.input_tokens = usage.input_tokens
+            result.output_tokens = usage.output_tokens
+            results.append(result)
+
+
+def run_benchmark(pdfs: Optional[List[str]] = None, offline: bool = True, workdir: Optional[str] = None,
+                  trace_heap: bool = False) -> BenchmarkRun:
+    """Run the corpus through every stage and time each one.
+
+    ``read_resume`` only runs when PDFs are given (it needs docling and
+    no LLM); the other stages use the markdown resumes in ``corpus/`` so
+    they are comparable between runs. ``trace_heap`` also records each
+    stage's Python heap peak, at the cost of much slower (and so not
+    comparable) timings.
+    """
+    if offline:
+        use_offline_llms()
+    run = BenchmarkRun(
+        started_at=time.time(),
+        offline=offline,
+        environment={"python": platform.python_version(), "machine": platform.machine(),
+                     "cpus": str(os.cpu_count())},
+    )
+    workdir = Path(workdir or tempfile.mkdtemp(prefix="interviewagent-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    resumes = sorted(CORPUS_DIR.glob("*.md"))
+
+    with measure("read_resume", run.stages, trace_heap) as stage:
+        if pdfs:
+            from resume_extract.resume_reader import read_resume
+            stage.items = len(read_resume(pdfs))
+        else:
+            stage.skipped = "no PDFs given"
+
+    from resume_extract.main import chunk_resume, extract_info
+    from generate_question.generate import main as generate_questions
+    from evaluation.evaluate import evaluate_technical_answer
+
+    chunked = []
+    with measure("chunk_resume", run.stages, trace_heap) as stage:
+        for resume in resumes:
+            out = workdir / f"{resume.stem}.chunks.json"
+            chunk_resume(str(resume), str(out))
+            chunked.append(out)
+        stage.items = len(chunked)
+
+    extracted = []
+    with measure("extract_info", run.stages, trace_heap) as stage:
+        for chunk in chunked:
+            out = workdir / chunk.name.replace(".chunks.json", ".info.json")
+            extract_info(str(chunk), save_path=str(out))
+            extracted.append(out)
+        stage.items = len(extracted)
+
+    with measure("generate_questions", run.stages, trace_heap) as stage:
+        for info in extracted:
+            generate_questions(str(info), str(workdir / info.name.replace(".info.json", ".questions.json")))
+        stage.items = len(extracted)
+
+    with open(CORPUS_DIR / "answers.json", 'r') as f:
+        graded = json.load(f)["questions"]
+    with measure("evaluate_answers", run.stages, trace_heap) as stage:
+        for item in graded:
+            for answer in item["answers"]:
+                evaluate_technical_answer(item["question"], answer)
+                stage.items += 1
+
+    return run
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.2) -> List[str]:
+    """List the stage metrics that got worse than ``baseline`` by more than ``tolerance``."""
+    previous = {stage["stage"]: stage for stage in baseline["stages"]}
+    regressions = []
+    for stage in current["stages"]:
+        before = previous.get(stage["stage"])
+        if before is None or stage["skipped"] or before["skipped"]:
+            continue
+        for metric in REGRESSION_METRICS:
+            old, new = before[metric], stage[metric]
+            if new > old * (1 + tolerance) and new - old > NOISE_FLOOR.get(metric, 0):
+                regressions.append(f"{stage['stage']}.{metric}: {old:.4g} -> {new:.4g}")
+    return regressions
+
+
+def save_run(run: BenchmarkRun, out_dir: str = "bench_results") -> Path:
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    path = Path(out_dir) / time.strftime("bench-%Y%m%d-%H%M%S.json", time.localtime(run.started_at))
+    with open(path, 'w') as f:
+        json.dump(run.as_dict(), f, indent=2)
+    return path
@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+# Modules a worker or CLI imports before doing any work, with the most
+# seconds each may take to import in a fresh interpreter
+IMPORT_BUDGETS = {
+    "llms.providers": 0.3,
+    "generate_question.generate": 1.2,
+    "evaluation.evaluate": 1.2,
+    "resume_extract.main": 1.2,
+}
+# Provider SDKs that must only load when a client is first requested
+HEAVY_MODULES = ["langchain_google_genai", "langchain_ollama", "google.genai", "ollama"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+__import__({module!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def import_cost(module: str) -> Dict:
+    """Import ``module`` in a fresh interpreter and report its time and the heavy SDKs it pulled in."""
+    probe = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def check_import_budgets(budgets: Dict[str, float] = None) -> List[str]:
+    """List modules that are over their import budget or load a provider SDK on import."""
+    problems = []
+    for module, budget in (budgets or IMPORT_BUDGETS).items():
+        cost = import_cost(module)
+        if cost["seconds"] > budget:
+            problems.append(f"{module}: import took {cost['seconds']:.3f}s, budget {budget:.3f}s")
+        if cost["loaded"]:
+            problems.append(f"{module}: imports {', '.join(cost['loaded'])} at import time")
+    return problems
@@ -0,0 +1,149 @@
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from evaluation.coverage import CompiledQuestion
+from evaluation.evaluate import (DEFAULT_UNCERTAINTY_BAND, AnswerEvaluator, CascadeStats,
+                                 question_from_dict, result_to_dict)
+
+
+def coverage_matrix(compiled: CompiledQuestion, answers: Sequence[str]) -> np.ndarray:
+    """Boolean (answers x expected points) coverage for one question.
+
+    Each answer becomes a row of the question's token-id incidence matrix,
+    and a point is covered when the row hits all of the point's tokens,
+    which is one matrix product for the whole batch.
+    """
+    width = len(compiled.vocabulary)
+    present = np.zeros((len(answers), width), dtype=np.float32)
+    for row, answer in enumerate(answers):
+        ids = compiled.answer_ids(answer)
+        if ids:
+            present[row, list(ids)] = 1.0
+    points = np.zeros((len(compiled.point_ids), width), dtype=np.float32)
+    for row, ids in enumerate(compiled.point_ids):
+        points[row, list(set(ids))] = 1.0
+    return present @ points.T >= points.sum(axis=1)
+
+
+def _summary(results: List[Dict[str, Any]], coverage: List[np.ndarray], llm_latencies: List[float],
+             llm_failures: int, elapsed: float, coverage_time: float, stats: CascadeStats) -> Dict[str, Any]:
+    ratios = [result["coverage_ratio"] for result in results]
+    llm_scores = [result["llm_score"] for result in results if "llm_score" in result]
+    return {
+        "questions": len(coverage),
+        "answers": len(results),
+        "elapsed": elapsed,
+        "coverage_seconds": coverage_time,
+        "answers_per_second": len(results) / elapsed if elapsed else 0.0,
+        "score_counts": dict(Counter(result["score"] for result in results)),
+        "mean_coverage": float(np.mean(ratios)) if ratios else 0.0,
+        "question_mean_coverage": [float(m.mean()) if m.size else 0.0 for m in coverage],
+        "llm_calls": len(llm_latencies),
+        "llm_failures": llm_failures,
+        "llm_latency_p50": float(np.percentile(llm_latencies, 50)) if llm_latencies else None,
+        "llm_latency_p90": float(np.percentile(llm_latencies, 90)) if llm_latencies else None,
+        "mean_llm_score": float(np.mean(llm_scores)) if llm_scores else None,
+        "decided_by": stats.as_dict()["decided_by"],
+        "escalation_rate": len(llm_latencies) / len(results) if results else 0.0,
+    }
+
+
+def evaluate_batch(
+    questions: Sequence[Dict[str, Any]],
+    answers: Sequence[Sequence[str]],
+    use_llm: bool = True,
+    max_concurrency: int = 4,
+    summary: Optional[Dict[str, Any]] = None,
+    cascade: bool = False,
+    uncertainty_band: Tuple[float, float] = DEFAULT_UNCERTAINTY_BAND,
+    semantic_scorer=None,
+) -> Iterator[Dict[str, Any]]:
+    """Grade ``answers[i][j]`` (candidate j's answer to question i) against ``questions[i]``.
+
+    Questions are compiled once and keyword coverage is computed per
+    question for all its answers at once (see coverage_matrix). Results,
+    the evaluate_technical_answer dict plus question_index, answer_index and
+    coverage_ratio, are yielded as soon as they are ready: straight away
+    without the LLM, otherwise as each judge call completes, with at most
+    ``max_concurrency`` calls in flight. With ``cascade`` only answers whose
+    keyword coverage is below the top of ``uncertainty_band`` go on: first
+    to ``semantic_scorer`` when given (one embedding call per question),
+    then, if still uncertain (see AnswerEvaluator.is_uncertain), to the judge.
+    ``summary``, when given, is filled with batch statistics once the
+    generator is exhausted.
+    """
+    if len(questions) != len(answers):
+        raise ValueError(f"Got {len(answers)} answer lists for {len(questions)} questions")
+    start = time.perf_counter()
+    # The batch schedules judge calls itself, so the evaluators never make them
+    stats = CascadeStats()
+    evaluators = [AnswerEvaluator(question_from_dict(q), use_llm=False, uncertainty_band=uncertainty_band,
+                                  stats=stats) for q in questions]
+    coverage = [coverage_matrix(ev.compiled, group) for ev, group in zip(evaluators, answers)]
+    coverage_time = time.perf_counter() - start
+
+    similarities: Dict[Tuple[int, int], List[float]] = {}
+    if cascade and semantic_scorer is not None:
+        for i, evaluator in enumerate(evaluators):
+            uncertain = [j for j in range(len(answers[i])) if evaluator.is_uncertain(coverage[i][j].tolist())]
+            if not uncertain:
+                continue
+            scored = semantic_scorer.score_many(evaluator.question.expected_points, [answers[i][j] for j in uncertain])
+            for j, semantic in zip(uncertain, scored):
+                # A point either tier found counts as covered
+                coverage[i][j] |= np.array(semantic.covered, dtype=bool)
+                similarities[(i, j)] = semantic.similarities
+
+    results: List[Dict[str, Any]] = []
+    llm_latencies: List[float] = []
+    llm_failures = 0
+
+    def _result(i: int, j: int, llm_evaluation=None) -> Dict[str, Any]:
+        flags = coverage[i][j].tolist()
+        result = evaluators[i].evaluate_answer(answers[i][j], coverage=flags, llm_evaluation=llm_evaluation,
+                                               point_similarities=similarities.get((i, j)))
+        out = result_to_dict(result)
+        out.update({
+            "question_index": i,
+            "answer_index": j,
+            "coverage_ratio": sum(flags) / len(flags) if flags else 0.0,
+        })
+        results.append(out)
+        return out
+
+    pairs = [(i, j) for i, group in enumerate(answers) for j in range(len(group))]
+    if use_llm and cascade:
+        escalated = []
+        for i, j in pairs:
+            if evaluators[i].is_uncertain(coverage[i][j].tolist(), semantic=(i, j) in similarities):
+                escalated.append((i, j))
+            else:
+                yield _result(i, j)
+        pairs = escalated
+    if not use_llm:
+        for i, j in pairs:
+            yield _result(i, j)
+    else:
+        def _judge(i: int, j: int):
+            call_start = time.perf_counter()
+            evaluation = evaluators[i]._get_llm_evaluation(answers[i][j])
+            return evaluation, time.perf_counter() - call_start
+
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            futures = {pool.submit(_judge, i, j): (i, j) for i, j in pairs}
+            for future in as_completed(futures):
+                i, j = futures[future]
+                evaluation, latency = future.result()
+                llm_latencies.append(latency)
+                if evaluation is None:
+                    # Keyword scoring still stands
+                    llm_failures += 1
+                yield _result(i, j, evaluation)
+
+    if summary is not None:
+        summary.update(_summary(results, coverage, llm_latencies, llm_failures,
+                                time.perf_counter() - start, coverage_time, stats))
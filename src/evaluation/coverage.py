@@ -0,0 +1,94 @@
+import re
+import threading
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Sequence, Tuple
+
+_TOKEN = re.compile(r"\w+")
+# Longest first; a suffix is only removed when at least 3 characters remain
+_SUFFIXES = ("ational", "ations", "ation", "ating", "ated", "ates", "ate", "ingly", "ings", "ing", "edly",
+             "ies", "ed", "es", "ly", "s")
+_DOUBLED = set("bdgmnprt")
+# Function words in expected points; the old substring scan matched these
+# almost everywhere, so requiring them as whole words would only add misses
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in into is it of on or that the their this to using via with".split()
+)
+
+
+@lru_cache(maxsize=65536)
+def light_stem(token: str) -> str:
+    """Cheap suffix stripper so "batching", "batched" and "batches" all match "batch"."""
+    if len(token) <= 3 or token.isdigit():
+        return token
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "s" and token[-2] in "su":
+                # "class", "status": not plurals
+                break
+            token = token[:-len(suffix)] + ("y" if suffix == "ies" else "")
+            if len(token) > 3 and token[-1] == token[-2] and token[-1] in _DOUBLED:
+                token = token[:-1]
+            break
+    if len(token) > 4 and token.endswith("e"):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str, stem: bool = True) -> List[str]:
+    """Lowercased word tokens of ``text``, optionally stemmed."""
+    tokens = _TOKEN.findall(text.lower())
+    return [light_stem(token) for token in tokens] if stem else tokens
+
+
+@dataclass(frozen=True)
+class CompiledQuestion:
+    """Expected points of one question as arrays of token ids.
+
+    A point is covered when every one of its tokens appears in the answer,
+    as a whole word rather than a substring ("go" no longer matches "good").
+    """
+    points: Tuple[str, ...]
+    point_ids: Tuple[array, ...]
+    vocabulary: Dict[str, int]
+    stem: bool
+
+    def answer_ids(self, answer: str) -> FrozenSet[int]:
+        """Ids of this question's tokens present in ``answer``; other words are dropped in the same pass."""
+        vocabulary = self.vocabulary
+        ids = set()
+        for token in _TOKEN.findall(answer.lower()):
+            token_id = vocabulary.get(light_stem(token) if self.stem else token)
+            if token_id is not None:
+                ids.add(token_id)
+        return frozenset(ids)
+
+    def covered(self, answer_ids) -> List[bool]:
+        """Coverage flag per expected point for a tokenized answer."""
+        return [all(token_id in answer_ids for token_id in ids) for ids in self.point_ids]
+
+    def coverage(self, answer: str) -> List[bool]:
+        return self.covered(self.answer_ids(answer))
+
+
+_compile_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _compile(points: Tuple[str, ...], stem: bool) -> CompiledQuestion:
+    vocabulary: Dict[str, int] = {}
+    point_ids = []
+    for point in points:
+        tokens = [token for token in _TOKEN.findall(point.lower()) if token not in STOPWORDS]
+        if stem:
+            tokens = [light_stem(token) for token in tokens]
+        ids = array("i", (vocabulary.setdefault(token, len(vocabulary)) for token in tokens))
+        point_ids.append(ids)
+    return CompiledQuestion(points=points, point_ids=tuple(point_ids), vocabulary=vocabulary, stem=stem)
+
+
+def compile_points(points: Sequence[str], stem: bool = True) -> CompiledQuestion:
+    """Compile expected points once; the same points reuse the cached result."""
+    with _compile_lock:
+        return _compile(tuple(points), stem)
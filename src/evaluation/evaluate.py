@@ -1,10 +1,11 @@
-from typing import List, Dict, Any, Optional
-import re
+from typing import List, Dict, Any, Optional, Tuple
+import threading
 from dataclasses import dataclass
 from enum import Enum
 import json
 from pydantic import BaseModel, Field
 from langchain_core.output_parsers import JsonOutputParser
+from evaluation.coverage import compile_points
 
 class EvaluationScore(Enum):
     EXCELLENT = 5
@@ -41,23 +42,99 @@ class EvaluationResult:
     llm_feedback: Optional[str] = None
     llm_score: Optional[float] = None
     llm_evaluation: Optional[LLMEvaluation] = None
+    point_similarities: Optional[List[float]] = None
+    decided_by: str = "lexical"
+
+# Coverage ratios at or above ``high`` are clearly good. Keyword coverage
+# below it is never conclusive, since a paraphrase misses the keywords but
+# not the point; semantic coverage below ``low`` is clearly POOR.
+DEFAULT_UNCERTAINTY_BAND = (0.3, 0.9)
+
+class CascadeStats:
+    """Counts of which tier (lexical, semantic, llm) decided each evaluation."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.decided_by: Dict[str, int] = {}
+
+    def record(self, tier: str):
+        with self._lock:
+            self.decided_by[tier] = self.decided_by.get(tier, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self.decided_by = {}
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.decided_by.values())
+            return {
+                "evaluations": total,
+                "decided_by": dict(self.decided_by),
+                "escalation_rate": self.decided_by.get("llm", 0) / total if total else 0.0,
+            }
+
+# Shared by all evaluators unless one is given its own
+cascade_stats = CascadeStats()
 
 class AnswerEvaluator:
-    def __init__(self, question: Question, use_llm: bool = True):
+    def __init__(self, question: Question, use_llm: bool = True, stem: bool = True,
+                 coverage_mode: str = "lexical", semantic_scorer=None, cascade: bool = False,
+                 uncertainty_band: Tuple[float, float] = DEFAULT_UNCERTAINTY_BAND,
+                 stats: Optional[CascadeStats] = None):
+        """``coverage_mode`` is "lexical" (keywords) or "semantic" (embedding similarity, see evaluation.semantic).
+
+        With ``cascade`` the keyword score is tried first, then the semantic
+        scorer if one is configured, and the LLM judge only runs while the
+        answer is still uncertain (see is_uncertain).
+        """
+        if coverage_mode not in ("lexical", "semantic"):
+            raise ValueError(f"Unknown coverage mode '{coverage_mode}', expected 'lexical' or 'semantic'")
         self.question = question
         self.expected_points = [point.lower() for point in question.expected_points]
         self.use_llm = use_llm
         self.parser = JsonOutputParser(pydantic_object=LLMEvaluation)
+        # Expected points as token-id arrays, compiled once per question
+        self.compiled = compile_points(self.expected_points, stem=stem)
+        self.coverage_mode = coverage_mode
+        self.semantic_scorer = semantic_scorer
+        self.cascade = cascade
+        self.uncertainty_band = uncertainty_band
+        self.stats = stats or cascade_stats
+        if coverage_mode == "semantic" and semantic_scorer is None:
+            from evaluation.semantic import get_semantic_scorer
+            self.semantic_scorer = get_semantic_scorer()
     
-    def evaluate_answer(self, answer: str) -> EvaluationResult:
-        answer_lower = answer.lower()
-        
+    def evaluate_answer(self, answer: str, coverage: Optional[List[bool]] = None,
+                        llm_evaluation: Optional[LLMEvaluation] = None,
+                        point_similarities: Optional[List[float]] = None) -> EvaluationResult:
+        """Evaluate ``answer``; ``coverage`` and ``llm_evaluation`` skip work already done by evaluate_batch.
+
+        ``point_similarities`` goes with a ``coverage`` the semantic scorer contributed to.
+        """
+        decided_by = "lexical" if point_similarities is None else "semantic"
+        if coverage is None:
+            if self.cascade:
+                coverage = self.compiled.coverage(answer)
+                if self.semantic_scorer is not None and self.is_uncertain(coverage):
+                    semantic = self.semantic_scorer.score(self.question.expected_points, answer)
+                    # A point either tier found counts as covered
+                    coverage = [lexical or sem for lexical, sem in zip(coverage, semantic.covered)]
+                    point_similarities = semantic.similarities
+                    decided_by = "semantic"
+            elif self.coverage_mode == "semantic":
+                semantic = self.semantic_scorer.score(self.question.expected_points, answer)
+                coverage, point_similarities = semantic.covered, semantic.similarities
+                decided_by = "semantic"
+            else:
+                coverage = self.compiled.coverage(answer)
+
         # Check coverage of expected points
         covered_points = []
         missing_points = []
         
-        for point in self.expected_points:
-            if self._check_point_coverage(point, answer_lower):
+        for point, covered in zip(self.expected_points, coverage):
+            if covered:
                 covered_points.append(point)
             else:
                 missing_points.append(point)
@@ -72,14 +149,16 @@ class AnswerEvaluator:
         # Initialize LLM feedback as None
         llm_feedback = None
         llm_score = None
-        llm_evaluation = None
         
         # If LLM evaluation is enabled, get LLM feedback
-        if self.use_llm:
+        if self.use_llm and llm_evaluation is None and (
+                not self.cascade or self.is_uncertain(coverage, semantic=point_similarities is not None)):
             llm_evaluation = self._get_llm_evaluation(answer)
-            if llm_evaluation:
-                llm_feedback = llm_evaluation['feedback']
-                llm_score = llm_evaluation['score']
+        if llm_evaluation:
+            llm_feedback = llm_evaluation['feedback']
+            llm_score = llm_evaluation['score']
+            decided_by = "llm"
+        self.stats.record(decided_by)
         
         return EvaluationResult(
             score=score,
@@ -88,13 +167,21 @@ class AnswerEvaluator:
             covered_points=covered_points,
             llm_feedback=llm_feedback,
             llm_score=llm_score,
-            llm_evaluation=llm_evaluation
+            llm_evaluation=llm_evaluation,
+            point_similarities=point_similarities,
+            decided_by=decided_by
         )
     
-    def _check_point_coverage(self, point: str, answer: str) -> bool:
-        """Check if the answer covers a specific expected point."""
-        keywords = re.findall(r'\w+', point.lower())
-        return all(keyword in answer for keyword in keywords)
+    def is_uncertain(self, coverage: List[bool], semantic: bool = False) -> bool:
+        """Whether a coverage result needs the next cascade tier.
+
+        Keyword coverage only settles an answer at the top of the
+        uncertainty band; coverage the semantic scorer contributed to also
+        settles it below the band.
+        """
+        ratio = sum(coverage) / len(coverage) if coverage else 0.0
+        low, high = self.uncertainty_band
+        return ratio < high and (ratio >= low or not semantic)
     
     def _calculate_score(self, coverage_ratio: float) -> EvaluationScore:
         """Calculate score based on coverage ratio."""
@@ -135,15 +222,14 @@ class AnswerEvaluator:
         
         return "\n".join(feedback)
     
-    def _get_llm_evaluation(self, answer: str) -> Optional[LLMEvaluation]:
-        """
-        Get LLM-based evaluation of the answer using Ollama.
-        """
-        from llms.providers import llm_ollama_model
-        ollama_model = llm_ollama_model()
-        
+    def build_llm_prompt(self, answer: str, score_first: bool = False) -> str:
+        """Judge prompt for ``answer``; ``score_first`` asks for the score before the long feedback."""
+        feedback_line = '"feedback": "<Detailed evaluation of the answer in description way>",'
+        score_line = '"score": <Numerical score between 0 and 1 (where 1 is perfect)>,'
+        first, second = (score_line, feedback_line) if score_first else (feedback_line, score_line)
+        response_fields = f"{first}\n                    {second}\n"
         # Format the evaluation prompt
-        prompt = f"""You are an expert technical interviewer evaluating a candidate's answer. 
+        return f"""You are an expert technical interviewer evaluating a candidate's answer. 
                     Please evaluate the following answer based on the question and expected points.
 
                     Question: {self.question.question_text}
@@ -166,15 +252,31 @@ class AnswerEvaluator:
                     
                     evaluate answer will be strictly in json format mentioned in the below
                     
-                    "feedback": "<Detailed evaluation of the answer in description way>",
-                    "score": <Numerical score between 0 and 1 (where 1 is perfect)>,
-                    "strengths": ["<Key strength 1>", "<Key strength 2>", "..."],
+                    {response_fields}                    "strengths": ["<Key strength 1>", "<Key strength 2>", "..."],
                     "areas_for_improvement": ["<Area needing improvement 1>", "<Area needing improvement 2>", "..."],
                     "technical_depth": <Score for technical depth between 0 and 1>,
                     "clarity": <Score for clarity and communication between 0 and 1>,
                     "completeness": <Score for completeness between 0 and 1>
                     """
 
+    def _get_llm_evaluation(self, answer: str) -> Optional[LLMEvaluation]:
+        """
+        Get LLM-based evaluation of the answer using Ollama.
+        """
+        from llms.providers import llm_for
+        # Shared client from the registry, not a new one per answer
+        ollama_model = llm_for("evaluation")
+        prompt = self.build_llm_prompt(answer)
+
+        from llms.structured import StructuredOutputError, invoke_structured, structured_output_enabled
+        if structured_output_enabled():
+            try:
+                # Decoded against the LLMEvaluation schema, score ranges included
+                return invoke_structured(ollama_model, prompt, LLMEvaluation)
+            except StructuredOutputError as e:
+                print(f"Error in LLM evaluation: {str(e)}")
+                return None
+
         try:
             print('instrs : ', self.parser.get_format_instructions())
             # Get response from Ollama
@@ -194,7 +296,8 @@ def evaluate_technical_answer(
     question_data: Dict[str, Any], 
     answer: str, 
     use_llm: bool = True,
-    additional_context: Optional[Dict[str, Any]] = None
+    additional_context: Optional[Dict[str, Any]] = None,
+    cascade: bool = False
 ) -> Dict[str, Any]:
     """
     Main function to evaluate a technical answer.
@@ -204,11 +307,19 @@ def evaluate_technical_answer(
         answer: The candidate's answer to evaluate
         use_llm: Whether to use LLM for evaluation
         additional_context: Optional additional context for evaluation
+        cascade: Only call the LLM when keyword coverage is inconclusive
     
     Returns:
         Dictionary containing evaluation results
     """
-    question = Question(
+    question = question_from_dict(question_data, additional_context)
+    evaluator = AnswerEvaluator(question, use_llm=use_llm, cascade=cascade)
+    result = evaluator.evaluate_answer(answer)
+    return result_to_dict(result)
+
+def question_from_dict(question_data: Dict[str, Any],
+                       additional_context: Optional[Dict[str, Any]] = None) -> Question:
+    return Question(
         question_text=question_data["question_text"],
         category=question_data["category"],
         difficulty=question_data["difficulty"],
@@ -216,17 +327,19 @@ def evaluate_technical_answer(
         expected_points=question_data["expected_points"],
         additional_context=additional_context
     )
-    
-    evaluator = AnswerEvaluator(question, use_llm=use_llm)
-    result = evaluator.evaluate_answer(answer)
-    
+
+def result_to_dict(result: EvaluationResult) -> Dict[str, Any]:
+    """The JSON-friendly form of an EvaluationResult returned by evaluate_technical_answer."""
     evaluation_result = {
         "score": result.score.name,
         "score_value": result.score.value,
         "feedback": result.feedback,
         "missing_points": result.missing_points,
-        "covered_points": result.covered_points
+        "covered_points": result.covered_points,
+        "decided_by": result.decided_by
     }
+    if result.point_similarities is not None:
+        evaluation_result["point_similarities"] = result.point_similarities
     
     if result.llm_evaluation:
         evaluation_result.update({
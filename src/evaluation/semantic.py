@@ -0,0 +1,137 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Small CPU-friendly sentence encoder; override with INTERVIEWAGENT_EMBEDDING_MODEL
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+_SENTENCE_BREAK = re.compile(r"\n+\s*(?:[-*•]|\d+[.)])?\s*|(?<=[.!?])\s+")
+
+_encoders: Dict[str, object] = {}
+_encoders_lock = threading.Lock()
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences and bullet items of an answer, the units matched against expected points."""
+    return [part.strip() for part in _SENTENCE_BREAK.split(text) if part and len(part.strip()) > 2]
+
+
+def _encoder(model_name: str):
+    """Shared SentenceTransformer on CPU, loaded on first use."""
+    encoder = _encoders.get(model_name)
+    if encoder is None:
+        with _encoders_lock:
+            encoder = _encoders.get(model_name)
+            if encoder is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError as e:
+                    raise ImportError(
+                        "Semantic coverage needs sentence-transformers: pip install sentence-transformers"
+                    ) from e
+                encoder = SentenceTransformer(model_name, device="cpu")
+                _encoders[model_name] = encoder
+    return encoder
+
+
+def sentence_transformer_embedder(model_name: Optional[str] = None) -> Callable[[List[str]], np.ndarray]:
+    model_name = model_name or os.environ.get("INTERVIEWAGENT_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+
+    def embed(texts: List[str]) -> np.ndarray:
+        return _encoder(model_name).encode(texts, batch_size=64, convert_to_numpy=True,
+                                           normalize_embeddings=True)
+    return embed
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+@dataclass
+class SemanticCoverage:
+    similarities: List[float]  # best cosine similarity per expected point
+    covered: List[bool]
+    best_sentences: List[Optional[str]]
+
+
+class SemanticCoverageScorer:
+    """Expected-point coverage by cosine similarity to the answer's sentences.
+
+    Points and sentences are embedded with ``embed`` (a local
+    sentence-transformers model by default) and compared with one matrix
+    product; a point is covered when its best sentence reaches
+    ``threshold``. Point embeddings are cached per question, up to
+    ``max_questions`` questions.
+    """
+
+    def __init__(self, threshold: float = 0.5, embed: Optional[Callable[[List[str]], np.ndarray]] = None,
+                 max_questions: int = 1024):
+        self.threshold = threshold
+        self.embed = embed or sentence_transformer_embedder()
+        self.max_questions = max_questions
+        self._points: "OrderedDict[Tuple[str, ...], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def point_vectors(self, points: Sequence[str]) -> np.ndarray:
+        key = tuple(points)
+        with self._lock:
+            vectors = self._points.get(key)
+            if vectors is not None:
+                self._points.move_to_end(key)
+                return vectors
+        vectors = _normalize(self.embed(list(key)))
+        with self._lock:
+            self._points[key] = vectors
+            while len(self._points) > self.max_questions:
+                self._points.popitem(last=False)
+        return vectors
+
+    def score(self, points: Sequence[str], answer: str) -> SemanticCoverage:
+        return self.score_many(points, [answer])[0]
+
+    def score_many(self, points: Sequence[str], answers: Sequence[str]) -> List[SemanticCoverage]:
+        """Score several answers to one question with a single embedding call."""
+        point_vectors = self.point_vectors(points)
+        sentences = [split_sentences(answer) for answer in answers]
+        flat = [sentence for group in sentences for sentence in group]
+        if not flat or not len(point_vectors):
+            return [SemanticCoverage([0.0] * len(points), [False] * len(points), [None] * len(points))
+                    for _ in answers]
+
+        # (points x all sentences) cosine matrix, then the best sentence per answer
+        similarity = point_vectors @ _normalize(self.embed(flat)).T
+        results, offset = [], 0
+        for group in sentences:
+            if not group:
+                results.append(SemanticCoverage([0.0] * len(points), [False] * len(points), [None] * len(points)))
+                continue
+            block = similarity[:, offset:offset + len(group)]
+            best = block.argmax(axis=1)
+            scores = block[np.arange(len(points)), best]
+            results.append(SemanticCoverage(
+                similarities=[float(s) for s in scores],
+                covered=[bool(s >= self.threshold) for s in scores],
+                best_sentences=[group[i] for i in best],
+            ))
+            offset += len(group)
+        return results
+
+
+_default_scorer: Optional[SemanticCoverageScorer] = None
+
+
+def get_semantic_scorer() -> SemanticCoverageScorer:
+    """Process-wide scorer, so the model and the point-embedding cache are shared."""
+    global _default_scorer
+    if _default_scorer is None:
+        with _encoders_lock:
+            if _default_scorer is None:
+                _default_scorer = SemanticCoverageScorer()
+    return _default_scorer
@@ -0,0 +1,179 @@
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from evaluation.evaluate import AnswerEvaluator
+
+
+def _partial_tag(text: str, tag: str) -> int:
+    """Length of the longest suffix of ``text`` that is a prefix of ``tag``."""
+    for size in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:size]):
+            return size
+    return 0
+
+
+class ThinkStripper:
+    """Drop ``<think>...</think>`` reasoning blocks from a token stream as it arrives.
+
+    Tags may be split across chunks; text that could be the start of a tag
+    is held back until the next chunk decides it.
+    """
+
+    OPEN, CLOSE = "<think>", "</think>"
+
+    def __init__(self):
+        self._buffer = ""
+        self._inside = False
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        visible = []
+        while True:
+            tag = self.CLOSE if self._inside else self.OPEN
+            index = self._buffer.find(tag)
+            if index >= 0:
+                if not self._inside:
+                    visible.append(self._buffer[:index])
+                self._buffer = self._buffer[index + len(tag):]
+                self._inside = not self._inside
+                continue
+            cut = len(self._buffer) - _partial_tag(self._buffer, tag)
+            if not self._inside:
+                visible.append(self._buffer[:cut])
+            self._buffer = self._buffer[cut:]
+            return "".join(visible)
+
+    def flush(self) -> str:
+        rest = "" if self._inside else self._buffer
+        self._buffer = ""
+        return rest
+
+
+class JsonFieldStream:
+    """Incremental parser for the top-level fields of one JSON object.
+
+    ``feed`` returns the (name, value) pairs completed by the new text,
+    so a scalar like ``score`` is available as soon as the delimiter after
+    it arrives, long before the object is closed. Anything before the first
+    ``{`` (e.g. a ```json fence) is ignored.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = "start"  # start, key, key_string, colon, value
+        self._key_start = 0
+        self._key: Optional[str] = None
+        self._value_start = 0
+
+    def _emit(self, end: int, out: List[Tuple[str, Any]]):
+        try:
+            value = json.loads(self._text[self._value_start:end])
+        except json.JSONDecodeError:
+            return
+        self.fields[self._key] = value
+        out.append((self._key, value))
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        out: List[Tuple[str, Any]] = []
+        self._text += text
+        while self._pos < len(self._text) and not self.done:
+            i, c = self._pos, self._text[self._pos]
+            self._pos += 1
+            if self._state == "start":
+                if c == "{":
+                    self._depth, self._state = 1, "key"
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._state == "key_string":
+                        self._key = json.loads(self._text[self._key_start:i + 1])
+                        self._state = "colon"
+                continue
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state == "key":
+                    self._key_start, self._state = i, "key_string"
+            elif c == ":" and self._depth == 1 and self._state == "colon":
+                self._value_start, self._state = i + 1, "value"
+            elif c in "{[":
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    if self._state == "value":
+                        self._emit(i, out)
+                    self.done = True
+            elif c == "," and self._depth == 1 and self._state == "value":
+                self._emit(i, out)
+                self._state = "key"
+        return out
+
+
+def _finish(evaluator: AnswerEvaluator, fields: Dict[str, Any], text: str) -> Optional[Dict[str, Any]]:
+    """The validated evaluation; the parser alone checks neither ranges nor types."""
+    model = evaluator.parser.pydantic_object
+    try:
+        return model.model_validate(fields).model_dump()
+    except ValidationError:
+        pass
+    try:
+        # Fall back to a full parse, e.g. when the model broke the JSON mid-way
+        return model.model_validate(evaluator.parser.parse(text)).model_dump()
+    except Exception as e:
+        print(f"Error in LLM evaluation: {str(e)}")
+        return None
+
+
+def stream_llm_evaluation(evaluator: AnswerEvaluator, answer: str, llm=None) -> Iterator[Tuple[str, Any]]:
+    """Stream the judge's evaluation of ``answer`` field by field.
+
+    Yields ``(field, value)`` for each LLMEvaluation field as soon as it is
+    complete in the token stream, with ``<think>`` blocks skipped, and
+    finally ``("evaluation", dict_or_None)`` with the whole result. The
+    prompt asks for the score before the feedback so it arrives first.
+    """
+    if llm is None:
+        from llms.providers import llm_for
+        llm = llm_for("evaluation")
+    stripper, fields = ThinkStripper(), JsonFieldStream()
+    visible = []
+    for chunk in llm.stream(evaluator.build_llm_prompt(answer, score_first=True)):
+        text = stripper.feed(chunk.content)
+        visible.append(text)
+        yield from fields.feed(text)
+    tail = stripper.flush()
+    visible.append(tail)
+    yield from fields.feed(tail)
+    yield "evaluation", _finish(evaluator, fields.fields, "".join(visible))
+
+
+async def astream_llm_evaluation(evaluator: AnswerEvaluator, answer: str, llm=None) -> AsyncIterator[Tuple[str, Any]]:
+    """Async version of stream_llm_evaluation."""
+    if llm is None:
+        from llms.providers import llm_for
+        llm = llm_for("evaluation")
+    stripper, fields = ThinkStripper(), JsonFieldStream()
+    visible = []
+    async for chunk in llm.astream(evaluator.build_llm_prompt(answer, score_first=True)):
+        text = stripper.feed(chunk.content)
+        visible.append(text)
+        for field in fields.feed(text):
+            yield field
+    tail = stripper.flush()
+    visible.append(tail)
+    for field in fields.feed(tail):
+        yield field
+    yield "evaluation", _finish(evaluator, fields.fields, "".join(visible))
@@ -0,0 +1,167 @@
+import re
+import zlib
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+def shingles(text: str, size: int = 2) -> List[str]:
+    """Overlapping ``size``-word shingles of the normalized text (the words themselves if it is shorter)."""
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+class MinHasher:
+    """MinHash signatures over word shingles; equal slots estimate Jaccard similarity."""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 2, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.array([zlib.crc32(s.encode()) for s in shingles(text, self.shingle_size)], dtype=np.uint64)
+        if not len(hashes):
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        # (shingles x permutations) universal hashes, minimum per permutation
+        permuted = (hashes[:, None] * self._a + self._b) % _MERSENNE & _MAX_HASH
+        return permuted.min(axis=0)
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(a == b))
+
+
+# Odd 64-bit multipliers for mixing the rows of a band into one key
+_BAND_MIX = np.random.RandomState(7).randint(1, 1 << 62, size=64, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+def band_keys(signature: np.ndarray, bands: int) -> List[int]:
+    """One 63-bit key per LSH band; two signatures share a key when the whole band matches.
+
+    Keys are stable across processes, so they can be stored (see QuestionBank).
+    """
+    rows = len(signature) // bands
+    block = signature.reshape(bands, rows) * _BAND_MIX[:rows]
+    keys = np.bitwise_xor.reduce(block, axis=1) ^ (np.arange(bands, dtype=np.uint64) * _BAND_MIX[-1])
+    return (keys >> np.uint64(1)).tolist()
+
+
+class LSHIndex:
+    """In-memory MinHash LSH index for near-duplicate text.
+
+    Signatures are split into ``bands`` bands; only texts sharing a band
+    are compared, so a lookup costs about the number of true candidates
+    rather than the index size. Candidates are confirmed by estimated
+    Jaccard similarity >= ``threshold``.
+    """
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 64, bands: int = 16,
+                 hasher: Optional[MinHasher] = None):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.bands = bands
+        self.hasher = hasher or MinHasher(num_perm)
+        self._buckets: Dict[int, List[Hashable]] = {}
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def query(self, text: str, signature: Optional[np.ndarray] = None) -> List[Tuple[Hashable, float]]:
+        """Stored keys similar to ``text`` with their estimated Jaccard, most similar first."""
+        signature = self.hasher.signature(text) if signature is None else signature
+        seen, matches = set(), []
+        for key in band_keys(signature, self.bands):
+            for other in self._buckets.get(key, ()):
+                if other not in seen:
+                    seen.add(other)
+                    similarity = jaccard(signature, self._signatures[other])
+                    if similarity >= self.threshold:
+                        matches.append((other, similarity))
+        return sorted(matches, key=lambda match: -match[1])
+
+    def add(self, key: Hashable, text: str, signature: Optional[np.ndarray] = None):
+        signature = self.hasher.signature(text) if signature is None else signature
+        self._signatures[key] = signature
+        for band_key in band_keys(signature, self.bands):
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def add_if_new(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """Index ``text`` unless it is a near-duplicate; returns the existing key it duplicates, if any."""
+        signature = self.hasher.signature(text)
+        matches = self.query(text, signature)
+        if matches:
+            return matches[0][0]
+        self.add(key, text, signature)
+        return None
+
+
+def _question_text(question) -> str:
+    return question["question"] if isinstance(question, dict) else question.question
+
+
+def deduplicate_sections(plan, outcomes: List[Tuple[List, float]], generate, index: Optional[LSHIndex] = None,
+                         max_rounds: int = 2, generate_many=None) -> Tuple[List[Tuple[List, float]], Dict[str, int]]:
+    """Drop near-duplicate questions across all sections and regenerate only those.
+
+    ``plan``/``outcomes`` are as in generate.main; questions are indexed in
+    order, so the first occurrence is kept. Each section that lost questions
+    asks ``generate(section_data, section_type, n)`` for ``n`` replacements,
+    with the rejected questions listed under ``avoid_questions`` in the
+    section data, for at most ``max_rounds`` rounds. With ``generate_many``
+    set, each round's requests go to it as one list of (section_data,
+    section_type, n) and it returns their questions in order, so they can
+    run concurrently.
+    """
+    index = index or LSHIndex()
+    stats = {"duplicates": 0, "replacement_calls": 0, "replaced": 0}
+    kept: List[List] = []
+    avoid: List[List[str]] = []
+    for questions, _ in outcomes:
+        section_kept, section_dups = [], []
+        for question in questions:
+            if index.add_if_new(len(index), _question_text(question)) is None:
+                section_kept.append(question)
+            else:
+                section_dups.append(_question_text(question))
+        stats["duplicates"] += len(section_dups)
+        kept.append(section_kept)
+        avoid.append(section_dups)
+    short = [len(rejected) for rejected in avoid]
+
+    for _ in range(max_rounds):
+        if not any(short):
+            break
+        requests = []
+        for position, needed in enumerate(short):
+            if not needed:
+                continue
+            _, _, section_data, section_type, _ = plan[position]
+            if isinstance(section_data, dict):
+                section_data = dict(section_data, avoid_questions=avoid[position])
+            requests.append((position, section_data, section_type, needed))
+        stats["replacement_calls"] += len(requests)
+        if generate_many is not None:
+            batches = generate_many([(data, kind, needed) for _, data, kind, needed in requests])
+        else:
+            batches = [generate(data, kind, needed) for _, data, kind, needed in requests]
+        # Indexed in section order whichever call finished first, so the result is deterministic
+        for (position, _, _, needed), questions in zip(requests, batches):
+            for question in questions[:needed]:
+                if index.add_if_new(len(index), _question_text(question)) is None:
+                    kept[position].append(question)
+                    short[position] -= 1
+                    stats["replaced"] += 1
+                else:
+                    avoid[position].append(_question_text(question))
+    return [(questions, latency) for questions, (_, latency) in zip(kept, outcomes)], stats
@@ -1,20 +1,25 @@
+import asyncio
 import json
-from typing import Dict, List
-from llms.providers import llm_google, llm_ollama_model
+import time
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from llms.providers import llm_for
+from llms.structured import (StructuredOutputError, ainvoke_structured, invoke_structured,
+                             structured_output_enabled)
 from .models import Question, SectionQuestions, GeneratedQuestions , ListQuestion
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import JsonOutputParser
 
-ollama_model = llm_ollama_model()
+def question_llm():
+    """Shared question-generation client, built on first use rather than at import."""
+    return llm_for("questions")
 
 def load_resume(file_path: str) -> Dict:
     """Load resume data from JSON file"""
     with open(file_path, 'r') as f:
         return json.load(f)
 
-def generate_questions_for_section(section_data: Dict, section_type: str, num_questions: int = 2) -> List[Question]:
-    """Generate questions for a specific section using LLM"""
-    
-    prompts = {
+PROMPTS = {
         'work_experience': """
         Given the following work experience, generate {num_questions} specific and technical interview questions.
         For each question, provide:
@@ -72,9 +77,49 @@ def generate_questions_for_section(section_data: Dict, section_type: str, num_qu
         """
     }
 
+
+def generate_questions_for_section(section_data: Dict, section_type: str, num_questions: int = 2) -> List[Question]:
+    """Generate questions for a specific section using LLM"""
+    messages = build_messages(section_data, section_type, num_questions)
+
+    if structured_output_enabled():
+        # Schema-constrained decoding, validated against Question with bounded repairs
+        try:
+            return invoke_structured(question_llm(), messages, List[Question])
+        except StructuredOutputError as e:
+            print(f"Question generation failed for {section_type}: {e}")
+            return []
+
+    # Get response from LLM
+    # response = llm_google(messages)  
+    response = question_llm().invoke(messages)
+    return parse_questions(response)
+
+
+async def agenerate_questions_for_section(section_data: Dict, section_type: str, num_questions: int = 2) -> List[Question]:
+    """Async version of generate_questions_for_section"""
+    messages = build_messages(section_data, section_type, num_questions)
+    if structured_output_enabled():
+        try:
+            return await ainvoke_structured(question_llm(), messages, List[Question])
+        except StructuredOutputError as e:
+            print(f"Question generation failed for {section_type}: {e}")
+            return []
+    response = await question_llm().ainvoke(messages)
+    return parse_questions(response)
+
+
+def build_messages(section_data: Dict, section_type: str, num_questions: int) -> List[Dict]:
+    # Questions to steer away from (see generate_question.dedup) are not resume details
+    avoid = []
+    if isinstance(section_data, dict) and "avoid_questions" in section_data:
+        section_data = dict(section_data)
+        avoid = section_data.pop("avoid_questions")
     # Construct the appropriate prompt
-    prompt = prompts.get(section_type, "Generate {num_questions} interview questions about: {details}")
+    prompt = PROMPTS.get(section_type, "Generate {num_questions} interview questions about: {details}")
     formatted_prompt = prompt.format(num_questions=num_questions, details=str(section_data))
+    if avoid:
+        formatted_prompt += "\nDo not ask questions similar to:\n" + "\n".join(f"- {q}" for q in avoid)
 
     messages = [
         {"role": "system", "content": "You are an expert technical interviewer. Generate specific, "
@@ -82,17 +127,17 @@ def generate_questions_for_section(section_data: Dict, section_type: str, num_qu
          "Return the questions in valid JSON format."},
         {"role": "user", "content": formatted_prompt}
     ]
+    return messages
 
-    # Get response from LLM
-    # response = llm_google(messages)  
-    response = ollama_model.invoke(messages) #.with_structured_output(ListQuestion)
+
+def parse_questions(response) -> List[Question]:
     parser = JsonOutputParser(pydantic_object=ListQuestion)
     # Parse the response into Question objects
     print(response.content)
     try:
         json_out = parser.invoke(response)
         return json_out
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, OutputParserException):
         # Fallback to simple question format if JSON parsing fails
         return [Question(
             question=q,
@@ -100,59 +145,114 @@ def generate_questions_for_section(section_data: Dict, section_type: str, num_qu
             difficulty="medium",
             context=None,
             expected_answer_points=[]
-        ) for q in response.split('\n') if q.strip()]
+        ).model_dump() for q in response.content.split('\n') if q.strip()]
+
+
+def plan_sections(resume_data: Dict) -> List[Tuple[str, str, Dict, str, int]]:
+    """Every LLM request main() makes, in output order:
+    (section_name, section_title, section data, prompt type, number of questions)"""
+    plan = []
+    if 'work_experience' in resume_data:
+        for experience in resume_data['work_experience']:
+            plan.append(("work_experience", experience.get('company', 'Unknown'), experience, 'work_experience', 3))
+    if 'projects' in resume_data:
+        for project in resume_data['projects']:
+            plan.append(("projects", project.get('name', 'Unknown'), project, 'projects', 2))
+    if 'skills' in resume_data:
+        plan.append(("skills", "Technical Skills", resume_data['skills'], 'skills', 3))
+    if 'publications_research' in resume_data:
+        for publication in resume_data['publications_research']:
+            plan.append(("publications", publication.get('title', 'Unknown'), publication, 'publications', 1))
+    return plan
+
+
+async def _generate_concurrently(plan, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(section_data, section_type, num_questions):
+        async with semaphore:
+            start_time = time.time()
+            questions = await agenerate_questions_for_section(section_data, section_type, num_questions)
+            return questions, time.time() - start_time
+
+    # gather keeps the plan order no matter which call finishes first
+    return await asyncio.gather(*(run_one(data, kind, num) for _, _, data, kind, num in plan))
 
-def main(meta_info_path: str , output_path: str):
+
+def _generate_many(requests, concurrency: int) -> List[List[Question]]:
+    """Questions for each (section_data, section_type, num_questions) request, run like main's sections."""
+    plan = [(None, None, data, kind, num) for data, kind, num in requests]
+    return [questions for questions, _ in asyncio.run(_generate_concurrently(plan, concurrency))]
+
+
+def main(meta_info_path: str , output_path: str, concurrency: Optional[int] = None,
+         packed_token_budget: Optional[int] = None, question_bank=None,
+         dedup_threshold: Optional[float] = None):
+    """Generate questions for every section of an extracted resume.
+
+    With ``concurrency`` set, all section requests are sent at once through
+    ``ainvoke`` with at most that many in flight; with ``packed_token_budget``
+    set, several items share one prompt (see generate_question.packed).
+    With ``question_bank`` (a QuestionBank or its path) skills questions
+    are served from the bank and only the gaps are generated. With
+    ``dedup_threshold`` (e.g. 0.6) set, questions whose estimated Jaccard
+    similarity to an earlier one reaches it are replaced (see
+    generate_question.dedup); with ``concurrency`` the replacement calls run
+    concurrently too. Sections keep the same order either way.
+    """
     # Load resume data
     resume_data = load_resume(meta_info_path)
-    
+    plan = plan_sections(resume_data)
+
+    banked = None
+    llm_plan = plan
+    if question_bank is not None:
+        from .question_bank import BankedPlan, QuestionBank
+        if isinstance(question_bank, str):
+            question_bank = QuestionBank(question_bank)
+        banked = BankedPlan(plan, question_bank)
+        llm_plan = banked.llm_plan
+
+    if packed_token_budget:
+        from .packed import generate_packed
+        outcomes, stats = generate_packed(llm_plan, packed_token_budget)
+        print(f"Packed generation: {stats['llm_calls']} LLM calls for {len(llm_plan)} sections, "
+              f"~{stats['prompt_tokens']} prompt tokens, {stats['retries']} retries")
+    elif concurrency:
+        outcomes = asyncio.run(_generate_concurrently(llm_plan, concurrency))
+    else:
+        outcomes = []
+        for _, _, section_data, section_type, num_questions in llm_plan:
+            start_time = time.time()
+            questions = generate_questions_for_section(section_data, section_type, num_questions)
+            outcomes.append((questions, time.time() - start_time))
+
+    if banked is not None:
+        outcomes = banked.merge(outcomes)
+        bank_stats = question_bank.stats()
+        print(f"Question bank: {bank_stats['served_from_bank']}/{bank_stats['requested']} skills questions "
+              f"served from the bank (hit rate {bank_stats['hit_rate']:.0%}), {bank_stats['entries']} banked")
+
+    if dedup_threshold:
+        from .dedup import LSHIndex, deduplicate_sections
+        generate_many = partial(_generate_many, concurrency=concurrency) if concurrency else None
+        outcomes, dedup_stats = deduplicate_sections(plan, outcomes, generate_questions_for_section,
+                                                     LSHIndex(threshold=dedup_threshold),
+                                                     generate_many=generate_many)
+        if dedup_stats["duplicates"]:
+            print(f"Replaced {dedup_stats['replaced']}/{dedup_stats['duplicates']} near-duplicate questions "
+                  f"with {dedup_stats['replacement_calls']} LLM calls")
+
     all_sections = []
     total_questions = 0
-    
-    # Generate questions for work experience
-    if 'work_experience' in resume_data:
-        for experience in resume_data['work_experience']:
-            print(experience)
-            print('+++'*100)
-            questions = generate_questions_for_section(experience, 'work_experience', 3)
-            all_sections.append(SectionQuestions(
-                section_name="work_experience",
-                section_title=experience.get('company', 'Unknown'),
-                questions=questions
-            ))
-            total_questions += len(questions)
-    if True:
-        # Generate questions for projects
-        if 'projects' in resume_data:
-            for project in resume_data['projects']:
-                questions = generate_questions_for_section(project, 'projects', 2)
-                all_sections.append(SectionQuestions(
-                    section_name="projects",
-                    section_title=project.get('name', 'Unknown'),
-                    questions=questions
-                ))
-                total_questions += len(questions)
-        
-        # Generate questions for skills
-        if 'skills' in resume_data:
-            questions = generate_questions_for_section(resume_data['skills'], 'skills', 3)
-            all_sections.append(SectionQuestions(
-                section_name="skills",
-                section_title="Technical Skills",
-                questions=questions
-            ))
-            total_questions += len(questions)
-        
-        # Generate questions for publications
-        if 'publications_research' in resume_data:
-            for publication in resume_data['publications_research']:
-                questions = generate_questions_for_section(publication, 'publications', 1)
-                all_sections.append(SectionQuestions(
-                    section_name="publications",
-                    section_title=publication.get('title', 'Unknown'),
-                    questions=questions
-                ))
-                total_questions += len(questions)
+    for (section_name, section_title, _, _, _), (questions, latency) in zip(plan, outcomes):
+        print(f"{section_name} / {section_title}: {len(questions)} questions in {latency:.2f} seconds")
+        all_sections.append(SectionQuestions(
+            section_name=section_name,
+            section_title=section_title,
+            questions=questions
+        ))
+        total_questions += len(questions)
     
     # Create the final structured output
     generated_questions = GeneratedQuestions(
@@ -163,6 +263,7 @@ def main(meta_info_path: str , output_path: str):
     # Save generated questions to a JSON file
     with open(output_path, 'w') as f:
         f.write(generated_questions.json())
+    return generated_questions
 
 # if __name__ == "__main__":
 #     main()
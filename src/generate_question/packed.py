@@ -0,0 +1,155 @@
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.output_parsers import JsonOutputParser
+from pydantic import ValidationError
+
+from llms.structured import StructuredOutputError, invoke_structured, structured_output_enabled
+
+from . import generate
+from .models import Question
+
+PACKED_PROMPT = """
+        For each of the following {section_label} items, generate {num_questions} specific and technical interview questions.
+        For each question, provide:
+        1. The question text
+        2. Category (technical/behavioral)
+        3. Difficulty level (easy/medium/hard)
+        4. Context or explanation
+        5. expected_answer_points - 2-3 key points expected in the answer(mention the points in bullet points)
+
+        {focus}
+        Return a single JSON object whose keys are the item ids below (e.g. "item_0") and whose values are
+        arrays of question objects with these fields(question , category , difficulty , context , expected_answer_points).
+        Questions for one item must only be about that item.
+{items}
+        """
+
+SECTION_LABELS = {
+    'work_experience': "work experience",
+    'projects': "project",
+    'publications': "publication",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting prompts
+    return len(text) // 4 + 1
+
+
+def _focus_line(section_type: str) -> str:
+    match = re.search(r"^\s*(Focus on .*)$", generate.PROMPTS.get(section_type, ""), re.MULTILINE)
+    return match.group(1).strip() if match else ""
+
+
+def build_packed_messages(items: List[Tuple[str, Dict]], section_type: str, num_questions: int) -> List[Dict]:
+    rendered = "\n".join(f"        [{item_id}]: {details}" for item_id, details in items)
+    prompt = PACKED_PROMPT.format(
+        section_label=SECTION_LABELS.get(section_type, section_type),
+        num_questions=num_questions,
+        focus=_focus_line(section_type),
+        items=rendered,
+    )
+    return [
+        {"role": "system", "content": "You are an expert technical interviewer. Generate specific, "
+         "technical questions that assess deep understanding and practical experience. "
+         "Return the questions in valid JSON format."},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def pack_items(indices: List[int], plan, token_budget: int) -> List[List[int]]:
+    """Greedily group plan entries so each group's item details fit in ``token_budget``."""
+    groups, current, used = [], [], 0
+    for index in indices:
+        cost = estimate_tokens(str(plan[index][2]))
+        if current and used + cost > token_budget:
+            groups.append(current)
+            current, used = [], 0
+        current.append(index)
+        used += cost
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _valid_questions(value) -> Optional[List[Dict]]:
+    if not isinstance(value, list) or not value:
+        return None
+    try:
+        return [Question(**q).model_dump() for q in value]
+    except (TypeError, ValidationError):
+        return None
+
+
+def _run_group(group: List[int], plan, outcomes: Dict[int, Tuple[List, float]], stats: Dict[str, int]):
+    _, _, _, section_type, num_questions = plan[group[0]]
+    if len(group) == 1:
+        # Finest granularity: the regular single-item prompt
+        start_time = time.time()
+        _, _, section_data, _, _ = plan[group[0]]
+        questions = generate.generate_questions_for_section(section_data, section_type, num_questions)
+        outcomes[group[0]] = (questions, time.time() - start_time)
+        messages = generate.build_messages(section_data, section_type, num_questions)
+        stats["prompt_tokens"] += sum(estimate_tokens(m["content"]) for m in messages)
+        stats["llm_calls"] += 1
+        return
+
+    items = [(f"item_{n}", plan[index][2]) for n, index in enumerate(group)]
+    messages = build_packed_messages(items, section_type, num_questions)
+    stats["prompt_tokens"] += sum(estimate_tokens(m["content"]) for m in messages)
+    stats["llm_calls"] += 1
+    start_time = time.time()
+    if structured_output_enabled():
+        try:
+            # No repair round here: missing items are retried in smaller groups below
+            parsed = invoke_structured(generate.question_llm(), messages, Dict[str, List[Question]], max_repairs=0)
+        except StructuredOutputError:
+            parsed = {}
+    else:
+        response = generate.question_llm().invoke(messages)
+        try:
+            parsed = JsonOutputParser().invoke(response)
+        except Exception:
+            parsed = {}
+    latency = time.time() - start_time
+    if not isinstance(parsed, dict):
+        parsed = {}
+
+    failed = []
+    for n, index in enumerate(group):
+        questions = _valid_questions(parsed.get(f"item_{n}"))
+        if questions is None:
+            failed.append(index)
+        else:
+            outcomes[index] = (questions, latency)
+    if failed:
+        stats["retries"] += 1
+        # Retry only what went missing, at half the group size each time
+        half = max(1, len(failed) // 2)
+        for start in range(0, len(failed), half):
+            _run_group(failed[start:start + half], plan, outcomes, stats)
+
+
+def generate_packed(plan, token_budget: int = 2000) -> Tuple[List[Tuple[List, float]], Dict[str, int]]:
+    """Generate questions for ``plan`` (see generate.plan_sections) with packed prompts.
+
+    Work experience, project and publication items of the same type are
+    grouped into one request up to ``token_budget`` tokens of item details,
+    and the keyed JSON answer is split back per item. Items missing or
+    invalid in the answer are retried in smaller groups, down to the normal
+    single-item prompt. Returns outcomes aligned with ``plan`` and call stats.
+    """
+    outcomes: Dict[int, Tuple[List, float]] = {}
+    stats = {"llm_calls": 0, "retries": 0, "prompt_tokens": 0}
+    by_type: Dict[Tuple[str, int], List[int]] = {}
+    for index, (_, _, _, section_type, num_questions) in enumerate(plan):
+        if section_type in SECTION_LABELS:
+            by_type.setdefault((section_type, num_questions), []).append(index)
+        else:
+            _run_group([index], plan, outcomes, stats)
+    for indices in by_type.values():
+        for group in pack_items(indices, plan, token_budget):
+            _run_group(group, plan, outcomes, stats)
+    return [outcomes[index] for index in range(len(plan))], stats
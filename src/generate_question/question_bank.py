@@ -0,0 +1,261 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from resume_extract.candidate_store import normalize_term
+from .dedup import MinHasher, band_keys, jaccard
+
+# ResumeSkills fields whose entries are technologies worth a shared question
+BANK_SKILL_FIELDS = ["technical_skills", "tools_and_platforms"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bank_questions (
+    id INTEGER PRIMARY KEY,
+    technology TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    served INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    UNIQUE (technology, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS bank_questions_lookup ON bank_questions(technology, difficulty, served);
+CREATE TABLE IF NOT EXISTS bank_lsh (
+    band_key INTEGER NOT NULL,
+    question_id INTEGER NOT NULL REFERENCES bank_questions(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS bank_lsh_band ON bank_lsh(band_key);
+"""
+
+# MinHash LSH parameters for near-duplicate checks (see generate_question.dedup)
+LSH_BANDS = 16
+LSH_THRESHOLD = 0.6
+
+
+def _fingerprint(question: Dict[str, Any]) -> str:
+    text = " ".join(question.get("question", "").lower().split())
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def skill_technologies(skills: Dict[str, Any]) -> List[str]:
+    """Normalized technologies of a ResumeSkills dict, in resume order, without duplicates."""
+    seen = []
+    for field in BANK_SKILL_FIELDS:
+        for term in skills.get(field) or []:
+            term = normalize_term(str(term))
+            if term and term not in seen:
+                seen.append(term)
+    return seen
+
+
+def technologies_in(question: Dict[str, Any], technologies: Sequence[str]) -> List[str]:
+    """Which of ``technologies`` a generated question is about, by whole-word mention in its text or context."""
+    text = f"{question.get('question', '')} {question.get('context') or ''}".lower()
+    return [tech for tech in technologies if re.search(rf"(?<!\w){re.escape(tech)}(?!\w)", text)]
+
+
+class QuestionBank:
+    """Generated questions stored by normalized technology and difficulty.
+
+    Skills questions are mostly about the same few technologies for every
+    candidate, so once generated they are served again from here; ``serve``
+    prefers the least-served questions to spread reuse. Near-duplicates of
+    a banked question are not stored again: MinHash band keys live in an
+    indexed table, so the check touches only rows sharing a band.
+    """
+
+    def __init__(self, path: str = "data/question_bank.sqlite"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.requested = 0
+        self.served = 0
+        self.generated = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(bank_questions)")}
+        if "signature" not in columns:
+            self._conn.execute("ALTER TABLE bank_questions ADD COLUMN signature BLOB")
+        self._conn.commit()
+        self.hasher = MinHasher()
+        self.near_duplicates = 0
+
+    def _near_duplicate_technologies(self, signature: np.ndarray, keys: List[int]) -> set:
+        """Technologies that already have a question whose text is a near-duplicate of ``signature``."""
+        rows = self._conn.execute(
+            "SELECT DISTINCT q.technology, q.signature FROM bank_lsh l JOIN bank_questions q ON q.id = l.question_id"
+            f" WHERE l.band_key IN ({','.join('?' * len(keys))})",
+            keys,
+        ).fetchall()
+        return {tech for tech, blob in rows
+                if blob is not None and jaccard(signature, np.frombuffer(blob, dtype=np.uint64)) >= LSH_THRESHOLD}
+
+    def add(self, questions: Sequence[Dict[str, Any]], technologies: Sequence[str]) -> int:
+        """Store ``questions`` under each of ``technologies`` they mention; returns rows added.
+
+        A question is skipped for a technology that already has a
+        near-duplicate of it.
+        """
+        now = time.time()
+        added = 0
+        with self._lock, self._conn:
+            for question in questions:
+                mentioned = technologies_in(question, technologies)
+                if not mentioned:
+                    continue
+                signature = self.hasher.signature(question.get("question", ""))
+                keys = band_keys(signature, LSH_BANDS)
+                covered = self._near_duplicate_technologies(signature, keys)
+                self.near_duplicates += len(covered & set(mentioned))
+                for tech in mentioned:
+                    if tech in covered:
+                        continue
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO bank_questions"
+                        " (technology, difficulty, fingerprint, data, created_at, signature) VALUES (?, ?, ?, ?, ?, ?)",
+                        (tech, str(question.get("difficulty", "medium")).lower(), _fingerprint(question),
+                         json.dumps(question), now, signature.tobytes()),
+                    )
+                    if cursor.rowcount:
+                        self._conn.executemany("INSERT INTO bank_lsh (band_key, question_id) VALUES (?, ?)",
+                                               [(key, cursor.lastrowid) for key in keys])
+                        added += 1
+        return added
+
+    def missing(self, technologies: Sequence[str]) -> List[str]:
+        """Which of ``technologies`` have no banked question."""
+        if not technologies:
+            return []
+        with self._lock:
+            banked = {row[0] for row in self._conn.execute(
+                "SELECT DISTINCT technology FROM bank_questions"
+                f" WHERE technology IN ({','.join('?' * len(technologies))})",
+                list(technologies),
+            )}
+        return [tech for tech in technologies if tech not in banked]
+
+    def questions_for(self, technology: str, difficulty: Optional[str] = None, limit: int = 10) -> List[Dict]:
+        sql = "SELECT data FROM bank_questions WHERE technology = ?"
+        params: List[Any] = [normalize_term(technology)]
+        if difficulty:
+            sql += " AND difficulty = ?"
+            params.append(difficulty.lower())
+        sql += " ORDER BY served, id LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [json.loads(row[0]) for row in self._conn.execute(sql, params)]
+
+    def serve(self, technologies: Sequence[str], num_questions: int,
+              difficulty: Optional[str] = None) -> Tuple[List[Dict], List[str]]:
+        """Up to ``num_questions`` banked questions spread over ``technologies``.
+
+        Takes one question per technology in turn, least served first.
+        Returns the questions and the technologies with nothing banked.
+        """
+        chosen: List[Tuple[int, Dict]] = []
+        fingerprints = set()
+        candidates: Dict[str, List[Tuple[int, str, str]]] = {}
+        with self._lock:
+            for tech in technologies:
+                sql = "SELECT id, fingerprint, data FROM bank_questions WHERE technology = ?"
+                params: List[Any] = [tech]
+                if difficulty:
+                    sql += " AND difficulty = ?"
+                    params.append(difficulty.lower())
+                sql += " ORDER BY served, id LIMIT ?"
+                params.append(num_questions)
+                candidates[tech] = self._conn.execute(sql, params).fetchall()
+            for round_ in range(num_questions):
+                for tech in technologies:
+                    if len(chosen) == num_questions:
+                        break
+                    rows = candidates[tech]
+                    if round_ < len(rows) and rows[round_][1] not in fingerprints:
+                        fingerprints.add(rows[round_][1])
+                        chosen.append((rows[round_][0], json.loads(rows[round_][2])))
+            with self._conn:
+                self._conn.executemany("UPDATE bank_questions SET served = served + 1 WHERE id = ?",
+                                       [(row_id,) for row_id, _ in chosen])
+            self.requested += num_questions
+            self.served += len(chosen)
+        gaps = [tech for tech in technologies if not candidates[tech]]
+        return [question for _, question in chosen], gaps
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM bank_questions").fetchone()[0]
+            technologies = self._conn.execute("SELECT COUNT(DISTINCT technology) FROM bank_questions").fetchone()[0]
+        return {
+            "requested": self.requested,
+            "served_from_bank": self.served,
+            "generated": self.generated,
+            "hit_rate": self.served / self.requested if self.requested else 0.0,
+            "entries": entries,
+            "technologies": technologies,
+            "near_duplicates_skipped": self.near_duplicates,
+        }
+
+
+class BankedPlan:
+    """Route the skills entries of a generate.plan_sections plan through a QuestionBank.
+
+    ``llm_plan`` holds what still needs the LLM: every non-skills entry,
+    plus, for a skills entry, a request covering the technologies with no
+    banked questions (one question each, up to the section's count; the
+    bank serves the rest), or, when every technology is banked but the
+    bank runs short, the missing number about all of them. Gaps are always
+    generated, so the bank fills up for them over time. ``merge`` puts the LLM
+    outcomes back in the original order, banks the new skills questions
+    and prepends the served ones.
+    """
+
+    def __init__(self, plan, bank: QuestionBank):
+        self.plan = plan
+        self.bank = bank
+        self.llm_plan = []
+        self._entries = []  # (index into llm_plan or None, served questions, technologies)
+        for entry in plan:
+            section_name, section_title, data, section_type, num_questions = entry
+            technologies = skill_technologies(data) if section_type == 'skills' and isinstance(data, dict) else []
+            if not technologies:
+                self._entries.append((len(self.llm_plan), [], []))
+                self.llm_plan.append(entry)
+                continue
+            gaps = bank.missing(technologies)
+            from_bank = num_questions - min(len(gaps), num_questions)
+            banked = [tech for tech in technologies if tech not in gaps]
+            if banked and from_bank:
+                served = bank.serve(banked, from_bank)[0]
+            else:
+                served, from_bank = [], 0
+            # serve counts what it was asked for; the gaps were requested too
+            bank.requested += num_questions - from_bank
+            if not gaps and len(served) >= num_questions:
+                self._entries.append((None, served, technologies))
+                continue
+            focus = gaps or technologies
+            self._entries.append((len(self.llm_plan), served, focus))
+            self.llm_plan.append((section_name, section_title, {"technical_skills": focus}, section_type,
+                                  num_questions - len(served)))
+
+    def merge(self, llm_outcomes: List[Tuple[List, float]]) -> List[Tuple[List, float]]:
+        outcomes = []
+        for (index, served, technologies), entry in zip(self._entries, self.plan):
+            if index is None:
+                outcomes.append((served, 0.0))
+                continue
+            questions, latency = llm_outcomes[index]
+            if technologies:
+                questions = [q if isinstance(q, dict) else q.model_dump() for q in questions]
+                self.bank.generated += len(questions)
+                self.bank.add(questions, technologies)
+            outcomes.append((served + list(questions), latency))
+        return outcomes
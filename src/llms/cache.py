@@ -0,0 +1,179 @@
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+_bypass = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_llm_cache():
+    """Force fresh LLM calls (and skip storing them) inside this block."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def _serialize(generations: Sequence[Generation]) -> str:
+    items = []
+    for gen in generations:
+        if isinstance(gen, ChatGeneration):
+            items.append({"message": message_to_dict(gen.message), "info": gen.generation_info})
+        else:
+            items.append({"text": gen.text, "info": gen.generation_info})
+    return json.dumps(items)
+
+
+def _deserialize(data: str) -> Sequence[Generation]:
+    generations = []
+    for item in json.loads(data):
+        if "message" in item:
+            message = messages_from_dict([item["message"]])[0]
+            generations.append(ChatGeneration(message=message, generation_info=item["info"]))
+        else:
+            generations.append(Generation(text=item["text"], generation_info=item["info"]))
+    return generations
+
+
+class SQLiteLLMCache(BaseCache):
+    """On-disk prompt/response cache with TTL and LRU size limits.
+
+    Plugs into LangChain's global LLM cache, so every ``invoke``/``ainvoke``
+    on a chat model is looked up by sha256(model + params, messages) before
+    the provider is called. Entries older than ``ttl`` seconds are treated as
+    misses; once more than ``max_entries`` rows are stored, the least
+    recently used ones are evicted.
+    """
+
+    def __init__(self, path: str = "data/llm_cache.sqlite", ttl: Optional[float] = None,
+                 max_entries: int = 100_000):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bypass = False
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache(last_access)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode()).hexdigest()
+
+    def _bypassed(self) -> bool:
+        return self.bypass or _bypass.get()
+
+    def lookup(self, prompt: str, llm_string: str):
+        if self._bypassed():
+            return None
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return _deserialize(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        if self._bypassed():
+            return
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        value = _serialize(return_val)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            # May overcount replaced (expired) rows; _evict recounts exactly
+            self._count += 1
+            if self._count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        # Trim to 90% so eviction is not paid on every insert at the limit
+        target = int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            " SELECT key FROM llm_cache ORDER BY last_access ASC"
+            " LIMIT max(0, (SELECT COUNT(*) FROM llm_cache) - ?))",
+            (target,),
+        )
+        self._count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._count = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": self._count,
+        }
+
+
+_install_lock = threading.Lock()
+
+
+def enable_llm_cache(path: Optional[str] = None, ttl: Optional[float] = None,
+                     max_entries: Optional[int] = None) -> Optional[SQLiteLLMCache]:
+    """Install the SQLite cache as LangChain's global LLM cache (once per process).
+
+    Configured by INTERVIEWAGENT_LLM_CACHE (set to 0 to disable),
+    INTERVIEWAGENT_LLM_CACHE_PATH, INTERVIEWAGENT_LLM_CACHE_TTL (seconds) and
+    INTERVIEWAGENT_LLM_CACHE_MAX_ENTRIES; explicit arguments win.
+    """
+    if os.environ.get("INTERVIEWAGENT_LLM_CACHE", "1") == "0":
+        return None
+    with _install_lock:
+        current = get_llm_cache()
+        if isinstance(current, SQLiteLLMCache):
+            return current
+        env_ttl = os.environ.get("INTERVIEWAGENT_LLM_CACHE_TTL")
+        cache = SQLiteLLMCache(
+            path=path or os.environ.get("INTERVIEWAGENT_LLM_CACHE_PATH", "data/llm_cache.sqlite"),
+            ttl=ttl if ttl is not None else (float(env_ttl) if env_ttl else None),
+            max_entries=max_entries or int(os.environ.get("INTERVIEWAGENT_LLM_CACHE_MAX_ENTRIES", 100_000)),
+        )
+        set_llm_cache(cache)
+        return cache
+
+
+def llm_cache_stats() -> Optional[Dict[str, Any]]:
+    cache = get_llm_cache()
+    return cache.stats() if isinstance(cache, SQLiteLLMCache) else None
@@ -0,0 +1,305 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9+#.\-]{2,}")
+
+
+def prompt_digest(messages: List[BaseMessage]) -> str:
+    """Stable hash of a conversation, used as the replay key."""
+    text = "\n".join(f"{m.type}:{m.content}" for m in messages)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _response_schema(prompt: str):
+    """Pick the pydantic shape the real pipeline expects for this prompt.
+
+    Returns (model, shape, count) or None for free-text prompts, where shape
+    is False (one object), True (a list) or "keyed" (a list per item id).
+    """
+    from evaluation.evaluate import LLMEvaluation
+    from generate_question.models import Question
+    from resume_extract.parser_items import Education, Project, Publication, ResumeSkills, WorkExperience
+
+    lowered = prompt.lower()
+    if "evaluating a candidate's answer" in lowered:
+        return LLMEvaluation, False, 1
+    if "whose keys are the item ids" in lowered:
+        # Packed question generation: one keyed array per item
+        match = re.search(r"generate (\d+)", lowered)
+        return Question, "keyed", int(match.group(1)) if match else 2
+    if "interview questions" in lowered:
+        match = re.search(r"generate (\d+)", lowered)
+        return Question, True, int(match.group(1)) if match else 2
+    if "extract work experience" in lowered:
+        return WorkExperience, True, 2
+    if "extract projects" in lowered:
+        return Project, True, 2
+    if "extract all **skills**" in lowered:
+        return ResumeSkills, False, 1
+    if "extract education" in lowered:
+        return Education, True, 1
+    if "publications and research" in lowered:
+        return Publication, True, 1
+    return None
+
+
+def _structured(kwargs: Dict[str, Any]) -> bool:
+    return isinstance(kwargs.get("format"), dict) or "response_schema" in kwargs
+
+
+class _Synthesizer:
+    """Build schema-valid JSON values from a pydantic JSON schema."""
+
+    def __init__(self, schema: Dict, rng: random.Random, words: List[str]):
+        self.defs = schema.get("$defs", {})
+        self.rng = rng
+        self.words = words or ["python", "docker", "kubernetes", "pipeline", "latency"]
+
+    def phrase(self, n: int) -> str:
+        return " ".join(self.rng.choice(self.words) for _ in range(n))
+
+    def value(self, schema: Dict, name: str = "") -> Any:
+        if "$ref" in schema:
+            return self.value(self.defs[schema["$ref"].split("/")[-1]], name)
+        if "anyOf" in schema:
+            options = [s for s in schema["anyOf"] if s.get("type") != "null"]
+            return self.value(options[0], name) if options else None
+        kind = schema.get("type")
+        if kind == "object":
+            return {
+                prop: self.value(sub, prop) for prop, sub in schema.get("properties", {}).items()
+            }
+        if kind == "array":
+            return [self.value(schema.get("items", {}), name) for _ in range(self.rng.randint(2, 4))]
+        if kind == "number":
+            low, high = schema.get("minimum", 0.0), schema.get("maximum", 1.0)
+            return round(self.rng.uniform(low, high), 2)
+        if kind == "integer":
+            return self.rng.randint(schema.get("minimum", 2010), schema.get("maximum", 2024))
+        if kind == "boolean":
+            return self.rng.random() < 0.5
+        fmt = schema.get("format")
+        if fmt == "email":
+            return f"{self.rng.choice(self.words).lower()}@example.com"
+        if fmt == "uri":
+            return f"https://example.com/{self.rng.randint(1, 10_000)}"
+        if name in ("category",):
+            return self.rng.choice(["technical", "behavioral"])
+        if name in ("difficulty",):
+            return self.rng.choice(["easy", "medium", "hard"])
+        if name in ("question", "feedback", "description", "context", "responsibilities"):
+            return self.phrase(12)
+        return self.phrase(3)
+
+
+class FakeResumeChatModel(BaseChatModel):
+    """Offline chat model for load tests and benchmarks.
+
+    Answers are replayed from ``replay_path`` (JSONL of ``prompt_sha256`` /
+    ``response`` records, see ``RecordingCallback``) when the prompt was
+    recorded, otherwise synthesized as schema-valid JSON for the extraction,
+    question generation and evaluation prompts. Latency is drawn from
+    ``latency_distribution`` around ``latency_mean`` plus output length over
+    ``tokens_per_second``, and ``max_concurrency`` emulates a server with a
+    fixed number of generation slots.
+    """
+
+    model: str = "fake-resume"
+    seed: int = 0
+    latency_mean: float = float(os.environ.get("INTERVIEWAGENT_FAKE_LATENCY", 0.0))
+    latency_jitter: float = 0.25
+    latency_distribution: str = "lognormal"
+    tokens_per_second: Optional[float] = None
+    max_concurrency: Optional[int] = None
+    replay_path: Optional[str] = None
+    think: bool = False
+
+    _replay: Optional[Dict[str, str]] = PrivateAttr(default=None)
+    _slots: Optional[threading.BoundedSemaphore] = PrivateAttr(default=None)
+    _async_slots: Dict[int, asyncio.Semaphore] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _calls: int = PrivateAttr(default=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-resume"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "seed": self.seed}
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    def _replayed(self, digest: str) -> Optional[str]:
+        if self.replay_path is None:
+            return None
+        if self._replay is None:
+            replay = {}
+            if os.path.exists(self.replay_path):
+                with open(self.replay_path, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            replay[record["prompt_sha256"]] = record["response"]
+            self._replay = replay
+        return self._replay.get(digest)
+
+    def respond(self, messages: List[BaseMessage], structured: bool = False) -> str:
+        """Response text; ``structured`` mimics schema-constrained decoding (bare JSON, no reasoning)."""
+        digest = prompt_digest(messages)
+        replayed = self._replayed(digest)
+        if replayed is not None:
+            return replayed
+
+        prompt = "\n".join(str(m.content) for m in messages)
+        rng = random.Random(f"{self.seed}:{digest}")
+        words = _WORD.findall(prompt)[-400:]
+
+        target = _response_schema(prompt)
+        if target is None:
+            if "intelligent document parser" in prompt:
+                from resume_extract.sectioner import split_sections
+                resume_text = prompt.split("parse the following resume content accordingly:")[-1]
+                sections, _ = split_sections(resume_text)
+                text = "\n".join(f"### {body}" for body in sections.values())
+            else:
+                text = _Synthesizer({}, rng, words).phrase(20)
+        else:
+            model, shape, count = target
+            synth = _Synthesizer(model.model_json_schema(), rng, words)
+            schema = model.model_json_schema()
+            if shape == "keyed":
+                payload = {
+                    item_id: [synth.value(schema) for _ in range(count)]
+                    for item_id in re.findall(r"\[(item_\d+)\]:", prompt)
+                }
+            elif shape:
+                payload = [synth.value(schema) for _ in range(count)]
+            else:
+                payload = synth.value(schema)
+            text = json.dumps(payload, indent=2)
+            if structured:
+                return text
+            text = "```json\n" + text + "\n```"
+        if self.think:
+            text = f"<think>\n{_Synthesizer({}, rng, words).phrase(40)}\n</think>\n{text}"
+        return text
+
+    def _delay(self, text: str, rng: random.Random) -> float:
+        delay = 0.0
+        if self.latency_mean > 0:
+            if self.latency_distribution == "fixed":
+                delay = self.latency_mean
+            elif self.latency_distribution == "uniform":
+                delay = rng.uniform(0, 2 * self.latency_mean)
+            elif self.latency_distribution == "exponential":
+                delay = rng.expovariate(1.0 / self.latency_mean)
+            else:
+                delay = self.latency_mean * rng.lognormvariate(0.0, self.latency_jitter)
+        if self.tokens_per_second:
+            delay += (len(text) / 4) / self.tokens_per_second
+        return delay
+
+    def _result(self, messages: List[BaseMessage], text: str) -> ChatResult:
+        input_tokens = sum(len(str(m.content)) for m in messages) // 4
+        output_tokens = len(text) // 4
+        message = AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        with self._lock:
+            self._calls += 1
+            calls = self._calls
+            if self.max_concurrency and self._slots is None:
+                self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        text = self.respond(messages, _structured(kwargs))
+        delay = self._delay(text, random.Random(f"{self.seed}:{calls}"))
+        if self._slots is not None:
+            with self._slots:
+                time.sleep(delay)
+        else:
+            time.sleep(delay)
+        return self._result(messages, text)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        """Emit the response word by word, spreading the simulated latency over the words."""
+        with self._lock:
+            self._calls += 1
+            calls = self._calls
+            if self.max_concurrency and self._slots is None:
+                self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        text = self.respond(messages, _structured(kwargs))
+        pieces = re.findall(r"\s*\S+\s*", text) or [text]
+        delay = self._delay(text, random.Random(f"{self.seed}:{calls}")) / len(pieces)
+        usage = self._result(messages, text).generations[0].message.usage_metadata
+        with self._slots if self._slots is not None else nullcontext():
+            for n, piece in enumerate(pieces):
+                time.sleep(delay)
+                last = n == len(pieces) - 1
+                chunk = ChatGenerationChunk(message=AIMessageChunk(
+                    content=piece, usage_metadata=usage if last else None))
+                if run_manager:
+                    run_manager.on_llm_new_token(piece, chunk=chunk)
+                yield chunk
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        with self._lock:
+            self._calls += 1
+            calls = self._calls
+        text = self.respond(messages, _structured(kwargs))
+        delay = self._delay(text, random.Random(f"{self.seed}:{calls}"))
+        if self.max_concurrency:
+            loop_id = id(asyncio.get_running_loop())
+            slots = self._async_slots.setdefault(loop_id, asyncio.Semaphore(self.max_concurrency))
+            async with slots:
+                await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(delay)
+        return self._result(messages, text)
+
+
+class RecordingCallback(BaseCallbackHandler):
+    """Append real prompt/response pairs to a JSONL file for later replay.
+
+    Pass as ``callbacks=[RecordingCallback(path)]`` to a real client's
+    ``invoke``; the file can then be used as ``FakeResumeChatModel(replay_path=path)``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._pending: Dict[Any, str] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._pending[run_id] = prompt_digest(messages[0])
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        digest = self._pending.pop(run_id, None)
+        if digest is None:
+            return
+        text = response.generations[0][0].text
+        with self._lock, open(self.path, 'a') as f:
+            f.write(json.dumps({"prompt_sha256": digest, "response": text}) + "\n")
@@ -1,23 +1,133 @@
-from dotenv import load_dotenv
+import importlib
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
 
-load_dotenv('/home/mohan/Documents/learning/agents_learn/.env')
+# Provider SDKs are imported on first use only (see _provider_class), so
+# importing this module, or anything that uses it, stays cheap.
+PROVIDERS = {
+    "google": "langchain_google_genai:ChatGoogleGenerativeAI",
+    "ollama": "langchain_ollama:ChatOllama",
+    # Offline, deterministic stand-in for load tests (no network, no daemon)
+    "fake": "llms.fake:FakeResumeChatModel",
+}
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_ollama import ChatOllama
+DEFAULT_MODELS = {
+    "google": "gemini-2.0-flash",
+    "ollama": "deepseek-r1:1.5b",
+    "fake": "fake-resume",
+}
+
+DEFAULT_PARAMS = {
+    "google": {"temperature": 0, "max_tokens": None, "timeout": None, "max_retries": 2},
+    "ollama": {"temperature": 0},
+    # Cached fake responses would hide the orchestration cost being measured
+    "fake": {"cache": False},
+}
+
+# Which provider each pipeline stage uses. Override per stage with
+# INTERVIEWAGENT_LLM_<ROLE>=<provider>[:<model>], e.g.
+# INTERVIEWAGENT_LLM_EVALUATION=ollama:llama3.1:8b
+ROLES = {
+    "chunking": "google",
+    "extraction": "ollama",
+    "questions": "ollama",
+    "evaluation": "ollama",
+}
+
+_clients: Dict[Tuple, Any] = {}
+_clients_lock = threading.Lock()
+_env_loaded = False
+
+
+def _load_env():
+    """Load the .env once, on first client lookup.
+
+    INTERVIEWAGENT_ENV_FILE points at a specific .env, otherwise the nearest
+    one above the working directory is used.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _clients_lock:
+        if _env_loaded:
+            return
+        from dotenv import find_dotenv, load_dotenv
+        load_dotenv(os.environ.get("INTERVIEWAGENT_ENV_FILE") or find_dotenv(usecwd=True))
+        _env_loaded = True
+
+
+def _provider_class(provider: str):
+    module_name, _, class_name = PROVIDERS[provider].partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _client_key(provider: str, model: str, params: Dict[str, Any]) -> Tuple:
+    return (provider, model, tuple(sorted((name, repr(value)) for name, value in params.items())))
+
+
+def get_llm(provider: str = "ollama", model: str = None, **params):
+    """Return the shared chat client for (provider, model, params).
+
+    Clients are built once and reused, so their HTTP connection pools stay
+    warm across calls and threads. The model defaults to
+    INTERVIEWAGENT_<PROVIDER>_MODEL, then to DEFAULT_MODELS. All clients
+    share the on-disk response cache from llms.cache.
+    """
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider '{provider}', expected one of {sorted(PROVIDERS)}")
+    _load_env()
+    if model is None:
+        model = os.environ.get(f"INTERVIEWAGENT_{provider.upper()}_MODEL", DEFAULT_MODELS[provider])
+    params = {**DEFAULT_PARAMS.get(provider, {}), **params}
+    key = _client_key(provider, model, params)
+
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                from llms.cache import enable_llm_cache
+                enable_llm_cache()
+                client = _provider_class(provider)(model=model, **params)
+                _clients[key] = client
+    return client
+
+
+def role_model(role: str) -> Tuple[str, str]:
+    """(provider, model) configured for a pipeline stage, without building a client."""
+    _load_env()
+    setting = os.environ.get(f"INTERVIEWAGENT_LLM_{role.upper()}", ROLES.get(role, "ollama"))
+    provider, _, model = setting.partition(":")
+    if not model:
+        model = os.environ.get(f"INTERVIEWAGENT_{provider.upper()}_MODEL", DEFAULT_MODELS.get(provider))
+    return provider, model
+
+
+def llm_for(role: str, **params):
+    """Client configured for a pipeline stage (see ROLES)."""
+    provider, model = role_model(role)
+    return get_llm(provider, model, **params)
+
+
+def provider_of(llm) -> Optional[str]:
+    """Registry name of the provider a client belongs to, without importing any SDK."""
+    cls = type(llm)
+    for provider, path in PROVIDERS.items():
+        module_name, _, class_name = path.partition(":")
+        if cls.__name__ == class_name and cls.__module__.startswith(module_name):
+            return provider
+    return None
+
+
+def clear_clients():
+    with _clients_lock:
+        _clients.clear()
 
 
 def llm_google():
-    llm_gemini = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash",
-        temperature=0,
-        max_tokens=None,
-        timeout=None,
-        max_retries=2,
-        # other params...
-    )
-    return llm_gemini
+    return get_llm("google")
 
 
 def llm_ollama_model():
-    llm_ollama = ChatOllama(temperature=0, model="deepseek-r1:1.5b")
-    return llm_ollama
+    return get_llm("ollama")
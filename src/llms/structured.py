@@ -0,0 +1,99 @@
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Union
+
+from langchain_core.utils.json import parse_json_markdown
+from pydantic import TypeAdapter, ValidationError
+
+from llms.providers import provider_of
+
+_THINK = re.compile(r"<think>.*?</think>", re.DOTALL)
+
+REPAIR_PROMPT = (
+    "Your previous answer could not be used: {error}\n"
+    "Reply again with only the corrected JSON value that matches the schema, no other text."
+)
+
+# Call-time arguments that make each provider decode against a JSON schema
+STRUCTURED_OUTPUT_KWARGS = {
+    "ollama": lambda schema: {"format": schema},
+    "google": lambda schema: {"response_mime_type": "application/json", "response_schema": schema},
+    "fake": lambda schema: {"format": schema},
+}
+
+
+class StructuredOutputError(ValueError):
+    """The model did not produce valid output within the allowed repairs."""
+
+
+def structured_output_enabled() -> bool:
+    """Schema-constrained decoding is on unless INTERVIEWAGENT_STRUCTURED_OUTPUT=0."""
+    return os.environ.get("INTERVIEWAGENT_STRUCTURED_OUTPUT", "1") != "0"
+
+
+@lru_cache(maxsize=None)
+def _adapter(target) -> TypeAdapter:
+    return TypeAdapter(target)
+
+
+def json_schema(target) -> Dict[str, Any]:
+    """JSON schema for a pydantic model or a typing form such as List[Model]."""
+    return _adapter(target).json_schema()
+
+
+def bind_structured(llm, target):
+    """``llm`` bound to decode ``target``'s schema, or unchanged for providers without support."""
+    kwargs = STRUCTURED_OUTPUT_KWARGS.get(provider_of(llm))
+    return llm.bind(**kwargs(json_schema(target))) if kwargs else llm
+
+
+def parse_structured(text: str, target) -> Any:
+    """Validate the JSON in ``text`` (reasoning blocks and fences allowed) against ``target``."""
+    adapter = _adapter(target)
+    value = adapter.validate_python(parse_json_markdown(_THINK.sub("", text)))
+    return adapter.dump_python(value, mode="json")
+
+
+def _as_messages(messages: Union[str, List]) -> List:
+    return [{"role": "user", "content": messages}] if isinstance(messages, str) else list(messages)
+
+
+def _repair(messages: List, text: str, error: Exception) -> List:
+    reason = str(error).splitlines()[0] if str(error) else type(error).__name__
+    return messages + [
+        {"role": "assistant", "content": text},
+        {"role": "user", "content": REPAIR_PROMPT.format(error=reason)},
+    ]
+
+
+def invoke_structured(llm, messages, target, max_repairs: int = 2) -> Any:
+    """Call ``llm`` with schema-constrained output and return the validated value as JSON data.
+
+    Invalid output is sent back with the validation error for at most
+    ``max_repairs`` more attempts before StructuredOutputError is raised.
+    """
+    bound = bind_structured(llm, target)
+    messages = _as_messages(messages)
+    for _ in range(max_repairs + 1):
+        text = bound.invoke(messages).content
+        try:
+            return parse_structured(text, target)
+        except (ValueError, ValidationError) as e:
+            error = e
+            messages = _repair(messages, text, e)
+    raise StructuredOutputError(f"No valid output after {max_repairs + 1} attempts: {error}")
+
+
+async def ainvoke_structured(llm, messages, target, max_repairs: int = 2) -> Any:
+    """Async version of invoke_structured."""
+    bound = bind_structured(llm, target)
+    messages = _as_messages(messages)
+    for _ in range(max_repairs + 1):
+        text = (await bound.ainvoke(messages)).content
+        try:
+            return parse_structured(text, target)
+        except (ValueError, ValidationError) as e:
+            error = e
+            messages = _repair(messages, text, e)
+    raise StructuredOutputError(f"No valid output after {max_repairs + 1} attempts: {error}")
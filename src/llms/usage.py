@@ -0,0 +1,52 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+
+class UsageCallback(BaseCallbackHandler):
+    """Counts LLM calls and token usage for every model run it is attached to."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def on_llm_end(self, response, **kwargs: Any) -> None:
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for gen in generations:
+                usage = getattr(getattr(gen, "message", None), "usage_metadata", None) or {}
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "llm_calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+        }
+
+
+_usage_callback: ContextVar[Optional[UsageCallback]] = ContextVar("interviewagent_usage_callback", default=None)
+# LangChain adds the handler in this context var to every run started inside it
+register_configure_hook(_usage_callback, inheritable=True)
+
+
+@contextmanager
+def track_usage():
+    """Collect LLM call and token counts for all model calls made in this block."""
+    callback = UsageCallback()
+    token = _usage_callback.set(callback)
+    try:
+        yield callback
+    finally:
+        _usage_callback.reset(token)
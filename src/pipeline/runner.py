@@ -0,0 +1,279 @@
+import hashlib
+import importlib.util
+import inspect
+import json
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    stage TEXT NOT NULL,
+    item TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    path TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (stage, item)
+) WITHOUT ROWID;
+"""
+
+
+def file_digest(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def module_source(name: str) -> str:
+    """Source text of module ``name``, read from its file without importing it."""
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.origin:
+        raise ModuleNotFoundError(name)
+    return Path(spec.origin).read_text()
+
+
+def version_fingerprint(parts: Iterable[Any]) -> str:
+    """Hash of what a stage's output depends on besides its inputs.
+
+    Modules, classes and functions contribute their source code; anything
+    else (prompt text, model ids, flags) its JSON form.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, ModuleType) or inspect.isclass(part) or inspect.isfunction(part):
+            text = inspect.getsource(part)
+        else:
+            text = json.dumps(part, sort_keys=True, default=str)
+        digest.update(text.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@dataclass
+class Stage:
+    """One pipeline step, run once per item (resume).
+
+    ``run(inputs, output)`` gets the artifact paths of ``deps`` (other
+    stages or external inputs such as "source") by name and writes its own
+    artifact to ``output``, ``<out_dir>/<name>/`` + ``output_name`` with
+    "{item}" filled in. ``version`` returns the code, prompts and model ids
+    the result depends on; it is hashed into every fingerprint. Up to
+    ``workers`` items run the stage at once.
+    """
+    name: str
+    run: Callable[[Dict[str, Path], Path], Any]
+    output_name: str
+    deps: Sequence[str] = ()
+    version: Callable[[], Iterable[Any]] = lambda: ()
+    workers: int = 1
+
+
+class Pipeline:
+    """A DAG of stages over named external inputs."""
+
+    def __init__(self, stages: Sequence[Stage], inputs: Sequence[str] = ("source",)):
+        self.inputs = list(inputs)
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        for stage in stages:
+            unknown = [dep for dep in stage.deps if dep not in self.stages and dep not in self.inputs]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown {unknown}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        order, visiting, done = [], set(), set()
+
+        def visit(name: str):
+            if name in done or name in self.inputs:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage '{name}' is part of a dependency cycle")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def upstream(self, targets: Iterable[str]) -> Set[str]:
+        """``targets`` and every stage they depend on."""
+        needed, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}', expected one of {self.order}")
+            if name not in needed:
+                needed.add(name)
+                todo.extend(dep for dep in self.stages[name].deps if dep in self.stages)
+        return needed
+
+
+class Manifest:
+    """SQLite record of the last artifact each (stage, item) produced and the fingerprint it was built from."""
+
+    def __init__(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, stage: str, item: str) -> Optional[Tuple[str, str, str]]:
+        """(fingerprint, output digest, path) or None."""
+        return self._conn.execute(
+            "SELECT fingerprint, digest, path FROM artifacts WHERE stage = ? AND item = ?", (stage, item)
+        ).fetchone()
+
+    def record(self, stage: str, item: str, fingerprint: str, digest: str, path: str, seconds: float):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts (stage, item, fingerprint, digest, path, seconds, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (stage, item, fingerprint, digest, path, seconds, time.time()),
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+@dataclass
+class StageReport:
+    ran: int = 0
+    cached: int = 0
+    failed: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class RunReport:
+    stages: Dict[str, StageReport]
+    # (stage, item, error)
+    failures: List[Tuple[str, str, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "stages": {name: asdict(report) for name, report in self.stages.items()},
+            "failures": [{"stage": stage, "item": item, "error": error} for stage, item, error in self.failures],
+            "elapsed": self.elapsed,
+        }
+
+
+def _timed(stage: Stage, inputs: Dict[str, Path], output: Path) -> float:
+    start_time = time.perf_counter()
+    stage.run(inputs, output)
+    return time.perf_counter() - start_time
+
+
+def run_pipeline(pipeline: Pipeline, items: Dict[str, Dict[str, Path]], out_dir: str,
+                 targets: Optional[Sequence[str]] = None, force: Sequence[str] = ()) -> RunReport:
+    """Bring the artifacts of ``targets`` (default: every stage) up to date for each item.
+
+    ``items`` maps an item id to its external input paths. An artifact's
+    fingerprint hashes the stage version with the contents of its inputs,
+    so a stage re-runs only when one of those changed, its output was
+    modified or removed, or it is listed in ``force``. A stage whose re-run
+    reproduces the previous output leaves the stages after it cached.
+    Items move through the DAG independently: an item's next stage starts
+    as soon as its inputs are ready, with each stage's own worker pool
+    bounding its parallelism. A failure only stops that item's downstream
+    stages; one missing an external input is skipped.
+    """
+    start_time = time.perf_counter()
+    out_dir = Path(out_dir)
+    selected = [name for name in pipeline.order if name in pipeline.upstream(targets or pipeline.order)]
+    unknown = set(force) - set(selected)
+    if unknown:
+        raise ValueError(f"Cannot force stages that will not run: {sorted(unknown)}")
+    versions = {name: version_fingerprint([name, *pipeline.stages[name].version()]) for name in selected}
+    manifest = Manifest(out_dir / "manifest.sqlite")
+    report = RunReport(stages={name: StageReport() for name in selected})
+    pools = {name: ThreadPoolExecutor(max_workers=pipeline.stages[name].workers, thread_name_prefix=name)
+             for name in selected}
+
+    # Per item: digest and path of each available input or artifact, and which
+    # stages were started and which have finished (ran, cached, failed or skipped)
+    digests = {item: {name: file_digest(path) for name, path in inputs.items()} for item, inputs in items.items()}
+    paths = {item: dict(inputs) for item, inputs in items.items()}
+    started: Dict[str, Set[str]] = {item: set() for item in items}
+    settled: Dict[str, Set[str]] = {item: set() for item in items}
+    running: Dict[Any, Tuple[str, str, str, Path]] = {}
+
+    def schedule(item: str):
+        """Settle or submit every stage of ``item`` whose dependencies are settled."""
+        progress = True
+        while progress:
+            progress = False
+            for name in selected:
+                stage = pipeline.stages[name]
+                if name in started[item] or any(
+                        dep in pipeline.stages and dep not in settled[item] for dep in stage.deps):
+                    continue
+                started[item].add(name)
+                if any(dep not in digests[item] for dep in stage.deps):
+                    # An external input is missing, or an upstream stage failed or was skipped
+                    report.stages[name].skipped += 1
+                    settled[item].add(name)
+                    progress = True
+                    continue
+                fingerprint = hashlib.sha256(
+                    json.dumps([versions[name], [digests[item][dep] for dep in stage.deps]]).encode()
+                ).hexdigest()
+                output = out_dir / name / stage.output_name.format(item=item)
+                previous = manifest.get(name, item)
+                if (name not in force and previous is not None and previous[0] == fingerprint
+                        and output.exists() and file_digest(output) == previous[1]):
+                    digests[item][name], paths[item][name] = previous[1], output
+                    report.stages[name].cached += 1
+                    settled[item].add(name)
+                    progress = True
+                    continue
+                output.parent.mkdir(parents=True, exist_ok=True)
+                inputs = {dep: paths[item][dep] for dep in stage.deps}
+                running[pools[name].submit(_timed, stage, inputs, output)] = (name, item, fingerprint, output)
+
+    try:
+        for item in items:
+            schedule(item)
+        while running:
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, item, fingerprint, output = running.pop(future)
+                stage_report = report.stages[name]
+                try:
+                    seconds = future.result()
+                    if not output.exists():
+                        raise FileNotFoundError(f"Stage '{name}' did not write {output}")
+                except Exception as e:
+                    stage_report.failed += 1
+                    report.failures.append((name, item, repr(e)))
+                    print(f"{name} failed for {item}: {e!r}")
+                else:
+                    digest = file_digest(output)
+                    manifest.record(name, item, fingerprint, digest, str(output), seconds)
+                    digests[item][name], paths[item][name] = digest, output
+                    stage_report.ran += 1
+                    stage_report.seconds += seconds
+                settled[item].add(name)
+                schedule(item)
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True)
+        manifest.close()
+    report.elapsed = time.perf_counter() - start_time
+    return report
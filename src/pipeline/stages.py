@@ -0,0 +1,142 @@
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from llms.providers import role_model
+from llms.structured import structured_output_enabled
+from pipeline.runner import Pipeline, RunReport, Stage, module_source, run_pipeline
+
+# Resume files picked up from a directory; text ones skip the docling conversion
+RESUME_SUFFIXES = [".pdf", ".png", ".jpg", ".jpeg", ".md", ".txt"]
+TEXT_SUFFIXES = [".md", ".txt"]
+
+# Items in flight per stage. Conversion stays at one: the docling converter
+# serializes documents anyway (see resume_reader.ConverterService).
+DEFAULT_WORKERS = {"read": 1, "chunk": 4, "extract": 4, "questions": 4, "evaluate": 4}
+
+
+def read_markdown(inputs: Dict[str, Path], output: Path):
+    source = inputs["source"]
+    if source.suffix.lower() in TEXT_SUFFIXES:
+        shutil.copyfile(source, output)
+        return
+    from resume_extract.resume_reader import read_resume
+    output.write_text(read_resume([str(source)])[0].markdown)
+
+
+def chunk(inputs: Dict[str, Path], output: Path):
+    from resume_extract.main import chunk_resume
+    chunk_resume(str(inputs["read"]), str(output))
+
+
+def extract(inputs: Dict[str, Path], output: Path):
+    from resume_extract.main import extract_info
+    extract_info(str(inputs["chunk"]), save_path=str(output))
+
+
+def questions(inputs: Dict[str, Path], output: Path):
+    from generate_question.generate import main as generate_questions
+    generate_questions(str(inputs["extract"]), str(output))
+
+
+def evaluate(inputs: Dict[str, Path], output: Path):
+    """Evaluate the answers file ({question text: answer}) against the generated questions it answers."""
+    from evaluation.evaluate import evaluate_technical_answer
+
+    with open(inputs["questions"], 'r') as f:
+        generated = json.load(f)
+    with open(inputs["answers"], 'r') as f:
+        answers = json.load(f)
+    results = []
+    for section in generated["sections"]:
+        for question in section["questions"]:
+            answer = answers.get(question["question"])
+            if answer is None:
+                continue
+            question_data = {
+                "question_text": question["question"],
+                "category": question["category"],
+                "difficulty": question["difficulty"],
+                "context": question.get("context") or "",
+                "expected_points": question.get("expected_answer_points") or [],
+            }
+            results.append({"section_name": section["section_name"], "question": question["question"],
+                            **evaluate_technical_answer(question_data, answer)})
+    with open(output, 'w') as f:
+        json.dump(results, f)
+
+
+# What each stage's output depends on besides its inputs. Prompts and code
+# are listed per stage so that editing one stage's prompt re-runs only it
+# and the stages after it.
+
+def _read_version():
+    return [read_markdown, module_source("resume_extract.resume_reader"), module_source("resume_extract.triage")]
+
+
+def _chunk_version():
+    from resume_extract import main
+    return [chunk, main.chunk_resume, main._chunk_with_llm, main.get_resume_chunking_prompt,
+            module_source("resume_extract.sectioner"), role_model("chunking")]
+
+
+def _extract_version():
+    from resume_extract import main
+    return [extract, main.extract_info, main.extract_section, main.build_section_prompt,
+            [(key, chunk_key, prompt, label, instructions)
+             for key, chunk_key, prompt, _, label, instructions in main.EXTRACTION_SECTIONS],
+            main.resume_template_instructions, main.SECTION_SCHEMAS, module_source("resume_extract.parser_items"),
+            module_source("llms.structured"), role_model("extraction"), structured_output_enabled()]
+
+
+def _questions_version():
+    return [questions, module_source("generate_question.generate"), module_source("generate_question.models"),
+            module_source("generate_question.dedup"), module_source("llms.structured"),
+            role_model("questions"), structured_output_enabled()]
+
+
+def _evaluate_version():
+    return [evaluate, module_source("evaluation.evaluate"), module_source("evaluation.coverage"),
+            module_source("llms.structured"), role_model("evaluation"), structured_output_enabled()]
+
+
+def build_pipeline(workers: Optional[Dict[str, int]] = None) -> Pipeline:
+    """resume file -> markdown -> sections -> extracted info -> questions (-> evaluation, given answers)."""
+    workers = {**DEFAULT_WORKERS, **(workers or {})}
+    return Pipeline([
+        Stage("read", read_markdown, "{item}.md", ["source"], _read_version, workers["read"]),
+        Stage("chunk", chunk, "{item}.json", ["read"], _chunk_version, workers["chunk"]),
+        Stage("extract", extract, "{item}.json", ["chunk"], _extract_version, workers["extract"]),
+        Stage("questions", questions, "{item}.json", ["extract"], _questions_version, workers["questions"]),
+        Stage("evaluate", evaluate, "{item}.json", ["questions", "answers"], _evaluate_version,
+              workers["evaluate"]),
+    ], inputs=["source", "answers"])
+
+
+def resume_items(source_dir: str, answers_dir: Optional[str] = None) -> Dict[str, Dict[str, Path]]:
+    """Pipeline items for every resume in ``source_dir``, keyed by file stem.
+
+    An item's answers are ``<answers_dir>/<stem>.json`` when that file exists.
+    """
+    items = {}
+    for path in sorted(Path(source_dir).iterdir()):
+        if path.suffix.lower() not in RESUME_SUFFIXES:
+            continue
+        if path.stem in items:
+            raise ValueError(f"Two resumes share the name '{path.stem}' in {source_dir}")
+        items[path.stem] = {"source": path}
+        if answers_dir and (Path(answers_dir) / f"{path.stem}.json").exists():
+            items[path.stem]["answers"] = Path(answers_dir) / f"{path.stem}.json"
+    return items
+
+
+def run_directory(source_dir: str, out_dir: str = "data/pipeline", answers_dir: Optional[str] = None,
+                  targets: Optional[Sequence[str]] = None, force: Sequence[str] = (),
+                  workers: Optional[Dict[str, int]] = None) -> RunReport:
+    """Run (or bring up to date) the pipeline for every resume in ``source_dir``.
+
+    Artifacts go to ``<out_dir>/<stage>/<stem>.*`` with fingerprints in
+    ``<out_dir>/manifest.sqlite``; see pipeline.runner.run_pipeline.
+    """
+    return run_pipeline(build_pipeline(workers), resume_items(source_dir, answers_dir), out_dir, targets, force)
@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from llms.providers import llm_for
+from resume_extract.main import EXTRACTION_SECTIONS, aextract_section
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, ``pct`` in [0, 100]."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def output_path_for(file_path: str, out_dir: str) -> Path:
+    """Unique per-resume output path: stem plus a hash of the absolute input path."""
+    path = Path(file_path)
+    digest = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:10]
+    return Path(out_dir) / f"{path.stem}-{digest}.json"
+
+
+class RateLimiter:
+    """Async token bucket: at most ``rate`` acquisitions per second, ``burst`` at once."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+@dataclass
+class SectionJob:
+    file_path: str
+    section: tuple
+    resume_info: Dict
+
+
+@dataclass
+class BatchExtractionStats:
+    resumes: int = 0
+    jobs: int = 0
+    completed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    max_queue_depth: int = 0
+    queue_depth_samples: List[int] = field(default_factory=list)
+    section_latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict:
+        latencies = {
+            key: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p90": percentile(values, 90),
+                "p99": percentile(values, 99),
+            }
+            for key, values in self.section_latencies.items()
+        }
+        samples = self.queue_depth_samples
+        return {
+            "resumes": self.resumes,
+            "jobs": self.jobs,
+            "completed": self.completed,
+            "failed": self.failed,
+            "elapsed": self.elapsed,
+            "jobs_per_second": self.completed / self.elapsed if self.elapsed else 0.0,
+            "resumes_per_minute": 60.0 * self.resumes / self.elapsed if self.elapsed else 0.0,
+            "max_queue_depth": self.max_queue_depth,
+            "mean_queue_depth": sum(samples) / len(samples) if samples else 0.0,
+            "section_latency": latencies,
+        }
+
+
+class BatchExtractor:
+    """Extract many chunked resumes through one shared queue of (resume, section) jobs.
+
+    ``workers`` bounds the number of LLM calls in flight across all resumes
+    and ``rate_limit`` (calls per second) caps how fast they are started, so
+    the Ollama server stays busy without being flooded. Each resume is
+    written to its own file under ``out_dir`` once all its sections are done,
+    and upserted into ``store`` (a CandidateStore) when one is given.
+    """
+
+    def __init__(self, out_dir: str = 'data/extracted', workers: int = 8,
+                 rate_limit: Optional[float] = None, llm=None, store=None):
+        self.out_dir = out_dir
+        self.store = store
+        self.workers = workers
+        self.rate_limiter = RateLimiter(rate_limit, burst=workers) if rate_limit else None
+        self.llm = llm
+        self.stats = BatchExtractionStats()
+
+    async def _worker(self, queue: asyncio.Queue, results: Dict, remaining: Dict):
+        while True:
+            job = await queue.get()
+            if job is None:
+                queue.task_done()
+                return
+            self.stats.queue_depth_samples.append(queue.qsize())
+            key = job.section[0]
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+                start_time = time.time()
+                json_out = await aextract_section(self.llm, job.resume_info, job.section)
+                self.stats.section_latencies.setdefault(key, []).append(time.time() - start_time)
+                results[job.file_path][key] = json_out
+                self.stats.completed += 1
+            except Exception as e:
+                self.stats.failed += 1
+                self.stats.errors.setdefault(job.file_path, {})[key] = repr(e)
+            finally:
+                remaining[job.file_path] -= 1
+                if remaining[job.file_path] == 0:
+                    try:
+                        self._save(job.file_path, results[job.file_path])
+                    except Exception as e:
+                        self.stats.failed += 1
+                        self.stats.errors.setdefault(job.file_path, {})["save"] = repr(e)
+                queue.task_done()
+
+    def _save(self, file_path: str, result: Dict):
+        # Same key order as extract_info regardless of completion order
+        ordered = {s[0]: result[s[0]] for s in EXTRACTION_SECTIONS if s[0] in result}
+        out_path = output_path_for(file_path, self.out_dir)
+        with open(out_path, 'w') as f:
+            json.dump(ordered, f)
+        if self.store is not None:
+            self.store.upsert(out_path.stem, ordered, source=file_path)
+
+    async def run(self, file_paths: List[str]) -> Dict[str, Dict]:
+        Path(self.out_dir).mkdir(parents=True, exist_ok=True)
+        if self.llm is None:
+            self.llm = llm_for("extraction")
+        # Jobs and results are keyed by path, so a path listed twice is extracted once
+        file_paths = list(dict.fromkeys(file_paths))
+        self.stats = BatchExtractionStats(resumes=len(file_paths))
+        queue: asyncio.Queue = asyncio.Queue()
+        results: Dict[str, Dict] = {}
+        remaining: Dict[str, int] = {}
+
+        # Resume by resume, so the first ones finish (and are saved) early
+        # instead of every resume completing only at the end of the batch
+        for file_path in file_paths:
+            with open(file_path, 'r') as f:
+                resume_info = json.load(f)
+            results[file_path] = {}
+            remaining[file_path] = len(EXTRACTION_SECTIONS)
+            for section in EXTRACTION_SECTIONS:
+                queue.put_nowait(SectionJob(file_path, section, resume_info))
+        self.stats.jobs = queue.qsize()
+        self.stats.max_queue_depth = queue.qsize()
+
+        start_time = time.time()
+        workers = [asyncio.ensure_future(self._worker(queue, results, remaining)) for _ in range(self.workers)]
+        for _ in workers:
+            queue.put_nowait(None)
+        await asyncio.gather(*workers)
+        self.stats.elapsed = time.time() - start_time
+        return results
+
+
+def extract_batch(file_paths: List[str], out_dir: str = 'data/extracted', workers: int = 8,
+                  rate_limit: Optional[float] = None) -> Dict[str, Dict]:
+    """Run a ``BatchExtractor`` over ``file_paths`` and print its statistics."""
+    extractor = BatchExtractor(out_dir=out_dir, workers=workers, rate_limit=rate_limit)
+    results = asyncio.run(extractor.run(file_paths))
+    print(json.dumps(extractor.stats.as_dict(), indent=2))
+    return results
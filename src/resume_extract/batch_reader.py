@@ -0,0 +1,243 @@
+import json
+import math
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from resume_extract.resume_reader import ConvertedResume, ConverterService, save_outputs
+
+
+class DocumentTimeout(Exception):
+    pass
+
+
+@dataclass
+class BatchFailure:
+    source: str
+    error: str
+
+
+@dataclass
+class BatchReport:
+    workers: int
+    submitted: int = 0
+    succeeded: int = 0
+    failures: List[BatchFailure] = field(default_factory=list)
+    elapsed: float = 0.0
+    cold_start_times: Dict[int, float] = field(default_factory=dict)
+
+    @property
+    def docs_per_minute(self) -> float:
+        return 60.0 * self.succeeded / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": len(self.failures),
+            "elapsed": self.elapsed,
+            "docs_per_minute": self.docs_per_minute,
+        }
+
+
+# Per-process converter, created once by the pool initializer
+_worker_service = None
+
+
+def _init_worker(threads_per_worker: int, fast_path: bool):
+    global _worker_service
+    # One intra-op thread per worker keeps processes from fighting over cores,
+    # which is what lets throughput scale with the number of workers.
+    os.environ["OMP_NUM_THREADS"] = str(threads_per_worker)
+    try:
+        import torch
+        torch.set_num_threads(threads_per_worker)
+    except ImportError:
+        pass
+    if fast_path:
+        from resume_extract.triage import TriagedConverter
+        _worker_service = TriagedConverter()
+    else:
+        _worker_service = ConverterService()
+    _worker_service.warm_up()
+
+
+def _raise_timeout(signum, frame):
+    raise DocumentTimeout("document conversion timed out")
+
+
+def _convert_in_worker(source: str, out_dir: Optional[str], timeout: Optional[float], export_document: bool = False):
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.alarm(max(1, math.ceil(timeout)))
+    try:
+        res = _worker_service.convert(source)
+        if out_dir is not None:
+            save_outputs(res, Path(out_dir))
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+    # The docling document stays in the worker; only the lightweight fields
+    # cross the process boundary, plus the document as JSON when the parent
+    # caches it.
+    document_json = None
+    if export_document and res.document is not None:
+        document_json = json.dumps(res.document.export_to_dict())
+    res.document = None
+    return res, document_json, os.getpid(), _worker_service.stats.cold_start_time
+
+
+class BatchConverter:
+    """Convert many resumes across a pool of worker processes.
+
+    Each worker holds its own warm converter (the triaged text/VLM router
+    unless ``fast_path`` is off). At most
+    ``max_in_flight`` documents are queued at a time, a document that exceeds
+    ``timeout`` seconds is recorded as a failure (enforced with SIGALRM, so
+    only on POSIX), and results are yielded as soon as each document finishes.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        timeout: Optional[float] = 300,
+        out_dir: Optional[str] = "scratch",
+        threads_per_worker: int = 1,
+        fast_path: bool = True,
+        use_cache: bool = True,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or 2 * self.workers
+        self.timeout = timeout
+        self.out_dir = out_dir
+        self.threads_per_worker = threads_per_worker
+        self.fast_path = fast_path
+        self.use_cache = use_cache
+        self.report = BatchReport(workers=self.workers)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, self.fast_path),
+        )
+
+    def _cache(self):
+        """Cache lookups happen here in the parent so workers never race on the index."""
+        if not self.use_cache:
+            return None
+        from resume_extract.conversion_cache import CachedConverter, get_conversion_cache
+        if self.fast_path:
+            from resume_extract.triage import TriagedConverter
+            service = TriagedConverter()
+        else:
+            service = ConverterService()
+        # Building the service does not load any model, it is only used for its fingerprint
+        return CachedConverter(service, get_conversion_cache())
+
+    def run(self, sources: Iterable[str]) -> Iterator[ConvertedResume]:
+        if self.out_dir is not None:
+            Path(self.out_dir).mkdir(parents=True, exist_ok=True)
+        self.report = BatchReport(workers=self.workers)
+        cached = self._cache()
+        keys = {}
+        pending_sources = iter(sources)
+        in_flight = {}
+        # Sources whose worker died under them. Each is retried once, alone,
+        # so only the document that really crashes a worker is marked failed.
+        suspects = deque()
+        retried = set()
+        start_time = time.time()
+        pool = self._new_pool()
+        try:
+            while True:
+                if suspects:
+                    if not in_flight:
+                        source = suspects.popleft()
+                        retried.add(source)
+                        in_flight[pool.submit(_convert_in_worker, source, self.out_dir, self.timeout,
+                                              keys.get(source) is not None)] = source
+                while not suspects and len(in_flight) < self.max_in_flight:
+                    source = next(pending_sources, None)
+                    if source is None:
+                        break
+                    if cached is not None:
+                        key = cached.key_for(source)
+                        hit = cached.cache.get(key) if key is not None else None
+                        if hit is not None:
+                            hit.source = str(source)
+                            hit.stem = Path(source).stem
+                            if self.out_dir is not None:
+                                save_outputs(hit, Path(self.out_dir))
+                            self.report.submitted += 1
+                            self.report.succeeded += 1
+                            yield hit
+                            continue
+                        keys[str(source)] = key
+                    future = pool.submit(_convert_in_worker, str(source), self.out_dir, self.timeout,
+                                         keys.get(str(source)) is not None)
+                    in_flight[future] = str(source)
+                    self.report.submitted += 1
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    source = in_flight.pop(future)
+                    try:
+                        res, document_json, pid, cold_start_time = future.result()
+                    except BrokenProcessPool as e:
+                        broken = True
+                        if source in retried:
+                            # It took down a worker while running alone
+                            self.report.failures.append(BatchFailure(source, repr(e)))
+                        else:
+                            suspects.append(source)
+                        continue
+                    except Exception as e:
+                        self.report.failures.append(BatchFailure(source, repr(e)))
+                        continue
+                    if keys.get(source) is not None:
+                        cached.cache.put(keys[source], res, document_json)
+                    self.report.succeeded += 1
+                    self.report.cold_start_times[pid] = cold_start_time
+                    self.report.elapsed = time.time() - start_time
+                    yield res
+
+                if broken:
+                    # A worker died (e.g. OOM) and took the pool with it; whatever
+                    # was still running on it is retried on a fresh one.
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = self._new_pool()
+                    suspects.extend(in_flight.values())
+                    in_flight = {}
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            self.report.elapsed = time.time() - start_time
+
+
+def convert_batch(sources: Iterable[str], workers: Optional[int] = None, **kwargs) -> List[ConvertedResume]:
+    """Convert ``sources`` with a process pool and return the successful results."""
+    batch = BatchConverter(workers=workers, **kwargs)
+    results = []
+    for res in batch.run(sources):
+        print(f"Converted {res.source} in {res.latency:.2f} seconds, pages: {res.num_pages}")
+        results.append(res)
+    for failure in batch.report.failures:
+        print(f"Failed {failure.source}: {failure.error}")
+    report = batch.report.as_dict()
+    print(
+        f"Batch finished: {report['succeeded']}/{report['submitted']} documents, "
+        f"{report['docs_per_minute']:.1f} docs/min with {report['workers']} workers"
+    )
+    return results
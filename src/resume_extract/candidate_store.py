@@ -0,0 +1,338 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Spellings folded into one term so skill queries match across resumes
+TERM_ALIASES = {
+    "k8s": "kubernetes",
+    "py": "python",
+    "python3": "python",
+    "postgres": "postgresql",
+    "js": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "aws": "amazon web services",
+    "gcp": "google cloud platform",
+    "tensor rt": "tensorrt",
+}
+
+# ResumeSkills fields, stored as the term kind
+SKILL_KINDS = ["technical_skills", "soft_skills", "domain_specific_skills", "tools_and_platforms", "languages"]
+
+_VERSION = re.compile(r"\s+v?\d+(\.\d+)*$")
+_SPACES = re.compile(r"\s+")
+_FTS_TOKEN = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    candidate_key TEXT NOT NULL UNIQUE,
+    source TEXT,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS candidate_terms (
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    term_id INTEGER NOT NULL REFERENCES terms(id),
+    kind TEXT NOT NULL,
+    PRIMARY KEY (candidate_id, term_id, kind)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS candidate_terms_term ON candidate_terms(term_id, candidate_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS candidate_text USING fts5(
+    experience, projects, publications, education, skills,
+    tokenize = 'porter unicode61'
+);
+"""
+
+
+def normalize_term(term: str) -> str:
+    """Canonical form of a skill or technology name: "Python 3.10 " -> "python", "K8s" -> "kubernetes"."""
+    term = _SPACES.sub(" ", term.strip().lower()).strip(" .,;:")
+    term = _VERSION.sub("", term)
+    return TERM_ALIASES.get(term, term)
+
+
+def _records(value: Any) -> List[Dict[str, Any]]:
+    """The dict entries of a list section; a lone dict counts as one entry, anything else is dropped."""
+    if isinstance(value, dict):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [item for item in value if isinstance(item, dict)]
+    return []
+
+
+def _term_list(value: Any) -> List[str]:
+    """Skill or technology names from a list, or from a comma/semicolon separated string."""
+    if isinstance(value, str):
+        return [part for part in re.split(r"[,;\n]", value) if part.strip()]
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value if isinstance(item, (str, int, float))]
+    return []
+
+
+def _skills(info: Dict[str, Any]) -> Dict[str, Any]:
+    skills = info.get("skills") or {}
+    # A bare list or string of skills is read as technical skills
+    return skills if isinstance(skills, dict) else {"technical_skills": skills}
+
+
+def _projects(info: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Top-level projects followed by those nested in work experience."""
+    projects = _records(info.get("projects"))
+    for experience in _records(info.get("work_experience")):
+        projects.extend(_records(experience.get("projects")))
+    return projects
+
+
+def _terms(info: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(normalized term, kind) pairs for the skills and technologies in one extract_info result.
+
+    LLM output does not always match the schema, so unexpected shapes are
+    coerced where the intent is clear and skipped otherwise.
+    """
+    pairs = set()
+    skills = _skills(info)
+    for kind in SKILL_KINDS:
+        for term in _term_list(skills.get(kind)):
+            pairs.add((normalize_term(term), kind))
+    for project in _projects(info):
+        for term in _term_list(project.get("technologies")):
+            pairs.add((normalize_term(term), "technology"))
+    return sorted(pair for pair in pairs if pair[0])
+
+
+def _text(info: Dict[str, Any]) -> Tuple[str, str, str, str, str]:
+    """Free text per FTS column for one extract_info result."""
+    def text(value):
+        if isinstance(value, (list, tuple)):
+            return "\n".join(text(item) for item in value)
+        return "" if value is None or isinstance(value, dict) else str(value)
+
+    def join(items, fields):
+        return "\n".join(text(item.get(field)) for item in _records(items) for field in fields)
+
+    projects = _projects(info)
+    skills = _skills(info)
+    return (
+        join(info.get("work_experience"), ("company", "title", "responsibilities")),
+        join(projects, ("title", "description")) + "\n" + " ".join(
+            t for p in projects for t in _term_list(p.get("technologies"))),
+        join(info.get("publications_research"), ("title", "publication_venue", "description")),
+        join(info.get("education"), ("institution", "degree")),
+        " ".join(term for kind in SKILL_KINDS for term in _term_list(skills.get(kind))),
+    )
+
+
+class CandidateStore:
+    """SQLite store of extract_info results with skill and full-text indexes.
+
+    Each candidate's skills (ResumeSkills fields) and project technologies
+    are normalized into a shared ``terms`` table with a (term, candidate)
+    index, so "who knows Kubernetes and Triton" is an index lookup. Work,
+    project, publication, education and skill text is indexed with FTS5.
+    ``upsert_many`` writes a whole batch in one transaction.
+    """
+
+    def __init__(self, path: str = "data/candidates.sqlite"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _term_ids(self, terms: Iterable[str]) -> Dict[str, int]:
+        terms = sorted(set(terms))
+        self._conn.executemany("INSERT OR IGNORE INTO terms (term) VALUES (?)", [(t,) for t in terms])
+        ids = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(terms), 500):
+            chunk = terms[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT term, id FROM terms WHERE term IN ({','.join('?' * len(chunk))})", chunk
+            )
+            ids.update(rows)
+        return ids
+
+    def _upsert(self, candidate_key: str, info: Dict[str, Any], source: Optional[str], term_ids: Dict[str, int]):
+        now = time.time()
+        candidate_id = self._conn.execute(
+            "INSERT INTO candidates (candidate_key, source, data, updated_at) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT(candidate_key) DO UPDATE SET source = excluded.source, data = excluded.data,"
+            " updated_at = excluded.updated_at RETURNING id",
+            (candidate_key, source, json.dumps(info), now),
+        ).fetchone()[0]
+        self._conn.execute("DELETE FROM candidate_terms WHERE candidate_id = ?", (candidate_id,))
+        self._conn.executemany(
+            "INSERT INTO candidate_terms (candidate_id, term_id, kind) VALUES (?, ?, ?)",
+            [(candidate_id, term_ids[term], kind) for term, kind in _terms(info)],
+        )
+        self._conn.execute("DELETE FROM candidate_text WHERE rowid = ?", (candidate_id,))
+        self._conn.execute(
+            "INSERT INTO candidate_text (rowid, experience, projects, publications, education, skills)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (candidate_id, *_text(info)),
+        )
+
+    def upsert(self, candidate_key: str, info: Dict[str, Any], source: Optional[str] = None):
+        self.upsert_many([(candidate_key, info, source)])
+
+    def upsert_many(self, records: Iterable[Tuple[str, Dict[str, Any], Optional[str]]]) -> int:
+        """Insert or replace (candidate_key, extract_info result, source) records in one transaction."""
+        records = list(records)
+        with self._lock, self._conn:
+            term_ids = self._term_ids(term for _, info, _ in records for term, _ in _terms(info))
+            for candidate_key, info, source in records:
+                self._upsert(candidate_key, info, source, term_ids)
+        return len(records)
+
+    def ingest_files(self, paths: Sequence[str], batch_size: int = 1000) -> int:
+        """Load extract_info JSON files, keyed by file stem, in batches of ``batch_size``."""
+        count, batch = 0, []
+        for path in paths:
+            with open(path, 'r') as f:
+                batch.append((Path(path).stem, json.load(f), str(path)))
+            if len(batch) >= batch_size:
+                count += self.upsert_many(batch)
+                batch = []
+        if batch:
+            count += self.upsert_many(batch)
+        return count
+
+    def sync_files(self, paths: Sequence[str], batch_size: int = 1000) -> int:
+        """Like ``ingest_files``, but only for files modified since their candidate was last stored."""
+        with self._lock:
+            stored = dict(self._conn.execute("SELECT candidate_key, updated_at FROM candidates"))
+        changed = [path for path in paths
+                   if Path(path).stat().st_mtime > stored.get(Path(path).stem, float("-inf"))]
+        return self.ingest_files(changed, batch_size) if changed else 0
+
+    def delete(self, candidate_key: str):
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM candidates WHERE candidate_key = ?", (candidate_key,)).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM candidate_text WHERE rowid = ?", row)
+                self._conn.execute("DELETE FROM candidates WHERE id = ?", row)
+
+    def get(self, candidate_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM candidates WHERE candidate_key = ?", (candidate_key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, candidate_keys: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """extract_info results for ``candidate_keys``; unknown keys are left out."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(candidate_keys), 500):
+                chunk = list(candidate_keys[start:start + 500])
+                rows = self._conn.execute(
+                    f"SELECT candidate_key, data FROM candidates WHERE candidate_key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                found.update((key, json.loads(data)) for key, data in rows)
+        return found
+
+    def keys(self, limit: Optional[int] = None, offset: int = 0) -> List[str]:
+        """Candidate keys in key order, optionally one page of them."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT candidate_key FROM candidates ORDER BY candidate_key LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            )
+            return [row[0] for row in rows]
+
+    def version(self) -> Tuple[int, float]:
+        """(candidate count, last update time); changes whenever candidates are added, replaced or deleted."""
+        with self._lock:
+            count, updated = self._conn.execute("SELECT COUNT(*), MAX(updated_at) FROM candidates").fetchone()
+        return count, updated or 0.0
+
+    def find_by_terms(self, terms: Sequence[str], match_all: bool = True, kinds: Optional[Sequence[str]] = None,
+                      limit: Optional[int] = None) -> List[str]:
+        """Keys of candidates with all (or, without ``match_all``, any) of ``terms``.
+
+        Terms are normalized like stored ones; ``kinds`` restricts the match
+        to some ResumeSkills fields and/or "technology" (project technologies).
+        """
+        wanted = sorted({normalize_term(term) for term in terms})
+        if not wanted:
+            return []
+        sql = (
+            "SELECT c.candidate_key FROM candidate_terms ct"
+            " JOIN terms t ON t.id = ct.term_id JOIN candidates c ON c.id = ct.candidate_id"
+            f" WHERE t.term IN ({','.join('?' * len(wanted))})"
+        )
+        params: List[Any] = list(wanted)
+        if kinds:
+            sql += f" AND ct.kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        sql += " GROUP BY ct.candidate_id"
+        if match_all:
+            sql += " HAVING COUNT(DISTINCT ct.term_id) = ?"
+            params.append(len(wanted))
+        sql += " ORDER BY c.candidate_key"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Full-text search over candidate text, best matches first.
+
+        ``query`` is treated as plain words that must all appear (stemmed);
+        use ``search_fts`` for raw FTS5 syntax.
+        """
+        words = _FTS_TOKEN.findall(query)
+        if not words:
+            return []
+        return self.search_fts(" AND ".join(f'"{word}"' for word in words), limit)
+
+    def search_fts(self, match: str, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.candidate_key, bm25(candidate_text) AS rank,"
+                " snippet(candidate_text, -1, '[', ']', '...', 12)"
+                " FROM candidate_text JOIN candidates c ON c.id = candidate_text.rowid"
+                " WHERE candidate_text MATCH ? ORDER BY rank LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        return [{"candidate_key": key, "rank": rank, "snippet": snippet} for key, rank, snippet in rows]
+
+    def top_terms(self, limit: int = 20, kinds: Optional[Sequence[str]] = None) -> List[Tuple[str, int]]:
+        """Most common terms and how many candidates have each."""
+        sql = "SELECT t.term, COUNT(DISTINCT ct.candidate_id) AS n FROM candidate_terms ct JOIN terms t ON t.id = ct.term_id"
+        params: List[Any] = []
+        if kinds:
+            sql += f" WHERE ct.kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        sql += " GROUP BY ct.term_id ORDER BY n DESC, t.term LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "candidates": self._conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0],
+                "terms": self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0],
+                "candidate_terms": self._conn.execute("SELECT COUNT(*) FROM candidate_terms").fetchone()[0],
+            }
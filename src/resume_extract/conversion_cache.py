@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from docling_core.types.doc import DoclingDocument
+
+from resume_extract.resume_reader import ConvertedResume
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(path: str, fingerprint: str) -> str:
+    """Content address for a conversion: file bytes plus converter fingerprint."""
+    return hashlib.sha256(f"{file_digest(path)}:{fingerprint}".encode()).hexdigest()
+
+
+def _atomic_write(path: Path, data: str):
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(data)
+    os.replace(tmp, path)
+
+
+class ConversionCache:
+    """Size-bounded, content-addressed store of converted resumes.
+
+    Entries live in ``<root>/<key>.md`` (and ``<key>.json`` for the docling
+    document when available). ``index.json`` records every entry's size,
+    stem and last access, so lookups and LRU eviction never scan the
+    directory. The index is rewritten on every insert and hit (so the
+    recency of a hit survives the process and eviction stays LRU, not
+    FIFO) and on ``flush``.
+    """
+
+    def __init__(self, root: str = "scratch/cache", max_bytes: int = 1 << 30):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if self.index_path.exists():
+            with open(self.index_path, 'r') as f:
+                entries = json.load(f)
+            for key, entry in sorted(entries.items(), key=lambda kv: kv[1]["last_access"]):
+                self._entries[key] = entry
+        self.total_bytes = sum(entry["size"] for entry in self._entries.values())
+
+    def get(self, key: str) -> Optional[ConvertedResume]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            md_path = self.root / f"{key}.md"
+            if not md_path.exists():
+                # Removed behind our back, forget it
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry["last_access"] = time.time()
+            self.hits += 1
+            self._write_index()
+
+        document = None
+        doc_path = self.root / f"{key}.json"
+        if entry.get("has_document") and doc_path.exists():
+            with open(doc_path, 'r') as f:
+                document = DoclingDocument.model_validate(json.load(f))
+        return ConvertedResume(
+            source=entry["source"],
+            stem=entry["stem"],
+            document=document,
+            markdown=md_path.read_text(),
+            num_pages=entry["num_pages"],
+            latency=0.0,
+        )
+
+    def put(self, key: str, result: ConvertedResume, document_json: Optional[str] = None):
+        """Store ``result``; ``document_json`` is its docling document already serialized, for
+        results whose document was dropped (see batch_reader)."""
+        md_data = result.markdown
+        doc_data = document_json
+        if doc_data is None and result.document is not None:
+            doc_data = json.dumps(result.document.export_to_dict())
+        size = len(md_data.encode()) + (len(doc_data.encode()) if doc_data else 0)
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            _atomic_write(self.root / f"{key}.md", md_data)
+            if doc_data is not None:
+                _atomic_write(self.root / f"{key}.json", doc_data)
+            self._entries[key] = {
+                "source": result.source,
+                "stem": result.stem,
+                "num_pages": result.num_pages,
+                "size": size,
+                "has_document": doc_data is not None,
+                "last_access": time.time(),
+            }
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+            self._write_index()
+
+    def flush(self):
+        with self._lock:
+            self._write_index()
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry["size"]
+        for suffix in (".md", ".json"):
+            path = self.root / f"{key}{suffix}"
+            if path.exists():
+                path.unlink()
+
+    def _write_index(self):
+        _atomic_write(self.index_path, json.dumps(self._entries))
+
+
+class CachedConverter:
+    """Wrap a converter service so repeated resumes skip conversion entirely."""
+
+    def __init__(self, service, cache: ConversionCache):
+        self.service = service
+        self.cache = cache
+
+    @property
+    def stats(self):
+        return self.service.stats
+
+    def warm_up(self) -> float:
+        return self.service.warm_up()
+
+    def key_for(self, source) -> Optional[str]:
+        if not os.path.isfile(str(source)):
+            # URLs and streams are not content-addressable without downloading them
+            return None
+        return cache_key(str(source), self.service.fingerprint())
+
+    def convert(self, source) -> ConvertedResume:
+        key = self.key_for(source)
+        if key is not None:
+            start_time = time.time()
+            res = self.cache.get(key)
+            if res is not None:
+                # The entry may come from a byte-identical file saved under another name
+                res.source = str(source)
+                res.stem = Path(source).stem
+                res.latency = time.time() - start_time
+                return res
+        res = self.service.convert(source)
+        if key is not None:
+            self.cache.put(key, res)
+        return res
+
+    def convert_many(self, sources) -> List[ConvertedResume]:
+        return [self.convert(source) for source in sources]
+
+
+_cache: Optional[ConversionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_conversion_cache() -> ConversionCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ConversionCache()
+    return _cache
@@ -1,13 +1,29 @@
 from resume_extract.prompts import get_resume_chunking_prompt
-from llms.providers import llm_google , llm_ollama_model
+from llms.providers import llm_for
+from llms.structured import ainvoke_structured, invoke_structured, structured_output_enabled
 from resume_extract.prompts import *
 from resume_extract.parser_items import *
-from typing import List
+from resume_extract.sectioner import classify_heading, split_sections
+from typing import Dict, List, Optional
+import asyncio
 import json
 from langchain_core.output_parsers import JsonOutputParser
 
 
-def chunk_resume(source,save_path):
+def _chunk_with_llm(text_):
+    msg = get_resume_chunking_prompt(text_)
+    llm_gemini = llm_for("chunking")
+    res1 = llm_gemini.invoke(msg)
+    resume_info_actual = {}
+    for i in res1.content.split('###'):
+        meta_ = i.strip().split('\n')[0]
+        find, _ = classify_heading(meta_)
+        if find is not None:
+            resume_info_actual[find] = i.strip()
+    return resume_info_actual
+
+
+def chunk_resume(source, save_path, min_confidence: float = 0.6, use_llm_fallback: bool = True):
     f = open(source, 'r')
     k1 = f.read()
     text_ = ''
@@ -16,90 +32,127 @@ def chunk_resume(source,save_path):
         if j.strip() != '':
             text_ += i +'\n'
     f.close()
-    msg = get_resume_chunking_prompt(text_)
-    llm_gemini = llm_google()
-    res1 = llm_gemini.invoke(msg)
-    resume_info_meta = {  'personal_details': 'personal',
-                    'education': 'education',
-                    'work_experience:': 'work experience',
-                    'skills': 'skills',
-                    'projects': 'projects',
-                    'certifications_awards_achievements': ['certifications' ,'awards','achievements'],
-                    'publications_research': ['publications', 'research']}
-    resume_info_actual = {}
-    for i in res1.content.split('###'):
-        meta_ = i.strip().split('\n')[0]
-        find = "none"
-        for info in resume_info_meta:
-            if isinstance(resume_info_meta[info],List) :
-                for key_meta in resume_info_meta[info]:
-                    if key_meta in meta_.lower():
-                        find = info
-                        print(find)
-                        break
-                if find != "none":
-                    break
-            elif isinstance(resume_info_meta[info],str):
-                key_meta = resume_info_meta[info]
-                if key_meta in meta_.lower():
-                    find = info
-            if find != "none":
-                break
-        if find in resume_info_meta:
-            resume_info_actual[find] = i.strip()
+
+    # Headings in the docling markdown are usually enough; only ask the LLM
+    # to re-chunk the resume when the local splitter is unsure.
+    resume_info_actual, confidence = split_sections(text_)
+    print(f"Local sectioning confidence: {confidence:.2f}")
+    if confidence < min_confidence and use_llm_fallback:
+        print("Low sectioning confidence, falling back to LLM chunking.")
+        resume_info_actual = _chunk_with_llm(text_)
 
     with open(save_path, 'w') as f:
         json.dump(resume_info_actual, f)
+    return resume_info_actual
+
+
+# (result key, chunked-resume key, prompt, pydantic model, label, append template instructions)
+EXTRACTION_SECTIONS = [
+    ('work_experience', 'work_experience:', work_experience_prompt, WorkExperience, "Work experience", True),
+    ('projects', 'projects', projects_prompt, Project, "Projects", True),
+    ('skills', 'skills', skills_prompt, ResumeSkills, "Skills", True),
+    ('education', 'education', education_prompt, Education, "Education", True),
+    ('publications_research', 'publications_research', publications_prompt, Publication, "Publications/Research", False),
+]
+
+
+# Answer shape per section for schema-constrained output (see llms.structured)
+SECTION_SCHEMAS = {
+    'work_experience': List[WorkExperience],
+    'projects': List[Project],
+    'skills': ResumeSkills,
+    'education': List[Education],
+    'publications_research': List[Publication],
+}
+
+
+def build_section_prompt(resume_info, section, structured: bool = False):
+    _, chunk_key, prompt, _, _, with_instructions = section
+    msg_input = prompt.format(resume_content=resume_info[chunk_key])
+    # The schema already fixes the output format in structured mode
+    if with_instructions and not structured:
+        msg_input += '\n' + resume_template_instructions
+    return msg_input
+
+
+def extract_section(llm, resume_info, section):
+    """Parsed JSON for one section, schema-constrained unless INTERVIEWAGENT_STRUCTURED_OUTPUT=0."""
+    key, _, _, model, _, _ = section
+    if structured_output_enabled():
+        return invoke_structured(llm, build_section_prompt(resume_info, section, structured=True),
+                                 SECTION_SCHEMAS[key])
+    parser = JsonOutputParser(pydantic_object=model)
+    return parser.invoke(llm.invoke(build_section_prompt(resume_info, section)))
+
+
+async def aextract_section(llm, resume_info, section):
+    """Async version of extract_section."""
+    key, _, _, model, _, _ = section
+    if structured_output_enabled():
+        return await ainvoke_structured(llm, build_section_prompt(resume_info, section, structured=True),
+                                        SECTION_SCHEMAS[key])
+    parser = JsonOutputParser(pydantic_object=model)
+    return parser.invoke(await llm.ainvoke(build_section_prompt(resume_info, section)))
+
+
+def save_resume_info(result, save_path):
+    with open(save_path, 'w') as f:
+        json.dump(result, f)
+    print(f"All extracted information has been saved to '{save_path}'.")
 
 
-def extract_info(file_path):
+def extract_info(file_path, save_path='data/resume_info.json'):
     result = {}
     with open(file_path, 'r') as f:
         resume_info = json.load(f)
 
-    msg_input = work_experience_prompt.format(resume_content=resume_info['work_experience:']) + '\n' + resume_template_instructions
-    llm_ollama = llm_ollama_model()
-    res_ollama = llm_ollama.invoke(msg_input)
-    print("Work experience LLM output received.")
-
-    parser = JsonOutputParser(pydantic_object=WorkExperience)
-    json_out = parser.invoke(res_ollama)
-    result['work_experience'] = json_out
-
-    msg_input = projects_prompt.format(resume_content=resume_info['projects']) + '\n' + resume_template_instructions
-    res_ollama = llm_ollama.invoke(msg_input)
-    print("Projects LLM output received.")
-
-    parser = JsonOutputParser(pydantic_object=Project)
-    json_out = parser.invoke(res_ollama)
-    result['projects'] = json_out
-
-    msg_input = skills_prompt.format(resume_content=resume_info['skills']) + '\n' + resume_template_instructions
-    res_ollama = llm_ollama.invoke(msg_input)
-    print("Skills LLM output received.")
+    llm_ollama = llm_for("extraction")
+    for section in EXTRACTION_SECTIONS:
+        key, _, _, _, label, _ = section
+        result[key] = extract_section(llm_ollama, resume_info, section)
+        print(f"{label} LLM output received.")
 
-    parser = JsonOutputParser(pydantic_object=ResumeSkills)
-    json_out = parser.invoke(res_ollama)
-    result['skills'] = json_out
-
-    msg_input = education_prompt.format(resume_content=resume_info['education']) + '\n' + resume_template_instructions
-    res_ollama = llm_ollama.invoke(msg_input)
-    print("Education LLM output received.")
-
-    parser = JsonOutputParser(pydantic_object=Education)
-    json_out = parser.invoke(res_ollama)
-    result['education'] = json_out
+    save_resume_info(result, save_path)
+    return result
 
-    msg_input = publications_prompt.format(resume_content=resume_info['publications_research'])  # + '\n' + resume_template_instructions
-    res_ollama = llm_ollama.invoke(msg_input)
-    print("Publications/Research LLM output received.")
 
-    parser = JsonOutputParser(pydantic_object=Publication)
-    json_out = parser.invoke(res_ollama)
-    result['publications_research'] = json_out
+async def _aextract_section(llm, resume_info, section, semaphore):
+    """Returns (key, parsed json, error) so one failing section cannot cancel the rest."""
+    key, _, _, _, label, _ = section
+    try:
+        async with semaphore:
+            json_out = await aextract_section(llm, resume_info, section)
+        print(f"{label} LLM output received.")
+        return key, json_out, None
+    except Exception as e:
+        print(f"{label} extraction failed: {e!r}")
+        return key, None, e
+
+
+async def extract_info_async(file_path, save_path='data/resume_info.json', max_concurrency: int = 5,
+                             errors: Optional[Dict[str, str]] = None):
+    """Concurrent version of extract_info.
+
+    All section prompts are sent at once (at most ``max_concurrency`` in
+    flight) and each response is parsed as soon as it arrives. A section
+    whose call or parsing fails is left out of the result and its error is
+    recorded in ``errors`` instead of failing the whole resume.
+    """
+    with open(file_path, 'r') as f:
+        resume_info = json.load(f)
 
-    with open('data/resume_info.json', 'w') as f:
-        json.dump(result, f)
-    print("All extracted information has been saved to 'data/resume_info.json'.")
+    llm_ollama = llm_for("extraction")
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = [_aextract_section(llm_ollama, resume_info, section, semaphore) for section in EXTRACTION_SECTIONS]
+    parsed = {}
+    for task in asyncio.as_completed(tasks):
+        key, json_out, error = await task
+        if error is None:
+            parsed[key] = json_out
+        elif errors is not None:
+            errors[key] = repr(error)
+
+    # Keep the same key order as the sequential version
+    result = {section[0]: parsed[section[0]] for section in EXTRACTION_SECTIONS if section[0] in parsed}
+    save_resume_info(result, save_path)
     return result
-
@@ -0,0 +1,153 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Keys match what chunk_resume has always written (note the trailing colon on
+# 'work_experience:'), since extract_info reads them back verbatim.
+SECTION_VOCABULARY = {
+    'personal_details': ['personal details', 'personal information', 'contact', 'contact information',
+                         'contact details', 'personal', 'profile', 'summary', 'professional summary',
+                         'objective', 'career objective', 'about me'],
+    'education': ['education', 'academic background', 'academics', 'educational qualifications',
+                  'qualifications', 'academic qualifications', 'education and training'],
+    'work_experience:': ['work experience', 'experience', 'professional experience', 'employment',
+                         'employment history', 'work history', 'career history', 'relevant experience',
+                         'internships', 'internship', 'industry experience'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core competencies', 'skill set', 'skillset',
+               'technologies', 'tools and technologies', 'technical expertise', 'competencies'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects', 'selected projects',
+                 'side projects', 'project experience'],
+    'certifications_awards_achievements': ['certifications', 'certificates', 'awards', 'achievements',
+                                           'honors', 'honours', 'accomplishments', 'licenses',
+                                           'awards and achievements', 'certifications and awards'],
+    'publications_research': ['publications', 'research', 'papers', 'research experience',
+                              'research and publications', 'patents'],
+}
+
+# Sections extract_info depends on; they drive the confidence score
+CORE_SECTIONS = ['work_experience:', 'education', 'skills']
+NOT_FOUND = "Not Found"
+
+_EXACT = {phrase: key for key, phrases in SECTION_VOCABULARY.items() for phrase in phrases}
+# Longest phrases first so 'research experience' wins over 'experience'
+_PARTIAL = sorted(_EXACT.items(), key=lambda kv: -len(kv[0]))
+_SECTION_TITLES = {
+    'personal_details': 'Personal Details',
+    'education': 'Education',
+    'work_experience:': 'Work Experience',
+    'skills': 'Skills',
+    'projects': 'Projects',
+    'certifications_awards_achievements': 'Certifications / Awards / Achievements',
+    'publications_research': 'Publications / Research',
+}
+
+
+def normalize_heading(line: str) -> str:
+    text = re.sub(r'^#+\s*', '', line.strip()).replace('&', ' and ')
+    return ' '.join(re.sub(r'[^a-z ]+', ' ', text.lower()).split())
+
+
+def classify_heading(header: str) -> Tuple[Optional[str], float]:
+    """Map a heading to a section key. Returns (key, match strength)."""
+    norm = normalize_heading(header)
+    if not norm:
+        return None, 0.0
+    if norm in _EXACT:
+        return _EXACT[norm], 1.0
+    # Only trailing matches count ("Relevant Work Experience", "Honors & Awards"),
+    # otherwise job headings like "Research Engineer, Acme" would start a section
+    if len(norm.split()) <= 6:
+        for phrase, key in _PARTIAL:
+            if norm == phrase or norm.endswith(' ' + phrase):
+                return key, 0.6
+    return None, 0.0
+
+
+def _markdown_level(line: str) -> int:
+    """Number of leading '#' of a markdown heading, 0 for other lines."""
+    match = re.match(r'\s*(#+)\s', line)
+    return len(match.group(1)) if match else 0
+
+
+def _looks_like_heading(line: str, markdown: bool) -> bool:
+    """Markdown headings only when they mark the sections; short bold/upper-case/colon lines otherwise."""
+    stripped = line.strip()
+    if markdown or stripped.startswith('#'):
+        return _markdown_level(line) > 0
+    words = stripped.strip('*_: ').split()
+    if not words or len(words) > 5:
+        return False
+    bold = stripped.startswith('**') and stripped.rstrip(':').endswith('**')
+    letters = [c for c in stripped if c.isalpha()]
+    upper = bool(letters) and all(c.isupper() for c in letters)
+    return bold or upper or stripped.endswith(':')
+
+
+def _is_inline_label(line: str) -> bool:
+    """Bold or colon (not upper-case) heading lines, which resumes also use inside entries ("Key Projects:")."""
+    return not all(c.isupper() for c in line if c.isalpha())
+
+
+def split_sections(text: str) -> Tuple[Dict[str, str], float]:
+    """Split resume markdown into chunk_resume sections without an LLM.
+
+    Headings are docling markdown headings matched against
+    ``SECTION_VOCABULARY``; only when none of them names a section are
+    short bold/upper-case/colon lines considered, so labels inside an entry
+    ("Key Projects:" under a job) stay in it. Of those, bold and colon
+    labels only start a section at the start of a block or before any
+    section opened; one in the middle of a section stays in it and lowers
+    the confidence. A markdown heading deeper than the level of the
+    document's section headings is likewise a sub-heading of the current
+    section. Text before the first
+    recognised heading is treated as personal details. The confidence is
+    high when the core sections were found under exact heading matches and
+    little of the resume was left in that leading block.
+    """
+    chunks: Dict[str, List[str]] = {}
+    current = 'personal_details'
+    chunks[current] = [_SECTION_TITLES[current] + ':']
+    strengths = []
+    total_lines = 0
+    lines = text.split('\n')
+    # Levels of the markdown headings that name a section; job titles and
+    # the candidate's name are often markdown headings too
+    levels = [_markdown_level(line) for line in lines if _markdown_level(line) and classify_heading(line)[0]]
+    markdown = bool(levels)
+    section_level = min(levels) if levels else 0
+    block_start = True
+    for line in lines:
+        if not line.strip():
+            block_start = True
+            continue
+        total_lines += 1
+        at_block_start, block_start = block_start, False
+        if _looks_like_heading(line, markdown):
+            key, strength = classify_heading(line)
+            if (key is not None and not markdown and not at_block_start and current != 'personal_details'
+                    and _is_inline_label(line)):
+                # Likely a label inside the current entry; if it was a heading, the split is wrong
+                strengths.append(0.0)
+                key = None
+            if key is not None and (not markdown or _markdown_level(line) <= section_level):
+                strengths.append(strength)
+                current = key
+                chunks.setdefault(current, [_SECTION_TITLES[current] + ':'])
+                continue
+        chunks[current].append(line)
+
+    sections = {}
+    for key, title in _SECTION_TITLES.items():
+        lines = chunks.get(key)
+        if lines and len(lines) > 1:
+            sections[key] = '\n'.join(lines).strip()
+        else:
+            sections[key] = f"{title}:\n{NOT_FOUND}"
+
+    found_core = sum(1 for key in CORE_SECTIONS if key in chunks and len(chunks[key]) > 1)
+    if not strengths:
+        return sections, 0.0
+    heading_quality = sum(strengths) / len(strengths)
+    preamble_share = (len(chunks['personal_details']) - 1) / max(total_lines, 1)
+    confidence = (0.6 * found_core / len(CORE_SECTIONS) + 0.25 * heading_quality
+                  + 0.15 * (1.0 - preamble_share))
+    return sections, confidence
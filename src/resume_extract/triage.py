@@ -0,0 +1,206 @@
+import hashlib
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import pypdfium2 as pdfium
+
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.pipeline_options import PdfPipelineOptions
+from docling.document_converter import DocumentConverter, PdfFormatOption
+
+from resume_extract.resume_reader import ConvertedResume, ConverterService, ConverterStats, get_converter_service
+
+TEXT_ROUTE = "text"
+VLM_ROUTE = "vlm"
+TRIAGE_STEP = "triage"
+
+
+@dataclass
+class PageRoute:
+    page_no: int
+    route: str
+    chars: int
+    quality: float
+
+
+@dataclass
+class RouteTiming:
+    route: str
+    start_page: int
+    end_page: int
+    seconds: float
+
+
+def text_layer_quality(text: str) -> float:
+    """Score a page's extracted text between 0 (garbage/empty) and 1 (clean).
+
+    Combines the share of ordinary characters (letters, digits, punctuation,
+    whitespace) with the share of tokens that look like words, which catches
+    both empty scans and broken font encodings that produce symbol soup.
+    """
+    if not text.strip():
+        return 0.0
+    good_chars = 0
+    for ch in text:
+        category = unicodedata.category(ch)
+        if ch.isspace() or category[0] in ("L", "N", "P") or ch in "+-*/=<>|@#$%&~^":
+            good_chars += 1
+    char_ratio = good_chars / len(text)
+
+    tokens = text.split()
+    wordlike = sum(1 for tok in tokens if len(tok) <= 30 and any(c.isalnum() for c in tok))
+    word_ratio = wordlike / len(tokens)
+    return char_ratio * word_ratio
+
+
+def triage_pdf(path: str, min_chars: int = 100, min_quality: float = 0.85) -> List[PageRoute]:
+    """Decide per page whether the PDF text layer is good enough to skip the VLM."""
+    routes = []
+    pdf = pdfium.PdfDocument(path)
+    try:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            text = textpage.get_text_range()
+            textpage.close()
+            page.close()
+            quality = text_layer_quality(text)
+            chars = len(text.strip())
+            route = TEXT_ROUTE if chars >= min_chars and quality >= min_quality else VLM_ROUTE
+            routes.append(PageRoute(page_no=index + 1, route=route, chars=chars, quality=quality))
+    finally:
+        pdf.close()
+    return routes
+
+
+def default_text_pipeline_options() -> PdfPipelineOptions:
+    pipeline_options = PdfPipelineOptions()
+    pipeline_options.do_ocr = False
+    pipeline_options.do_table_structure = False
+    return pipeline_options
+
+
+def build_text_converter(pipeline_options: Optional[PdfPipelineOptions] = None) -> DocumentConverter:
+    """Layout-only PDF pipeline: reads the embedded text layer, no OCR, no VLM"""
+    if pipeline_options is None:
+        pipeline_options = default_text_pipeline_options()
+    return DocumentConverter(
+        format_options={
+            InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options),
+        }
+    )
+
+
+def _group_runs(routes: List[PageRoute]):
+    """Collapse consecutive pages with the same route into (route, start, end) runs."""
+    runs = []
+    for page in routes:
+        if runs and runs[-1][0] == page.route and runs[-1][2] == page.page_no - 1:
+            runs[-1][2] = page.page_no
+        else:
+            runs.append([page.route, page.page_no, page.page_no])
+    return runs
+
+
+class TriagedConverter:
+    """Route each page to the cheap text-layer pipeline or the VLM.
+
+    Born-digital pages go through ``build_text_converter``; only pages whose
+    text layer fails ``text_layer_quality`` (scans, images, broken encodings)
+    fall back to the VLM, which is loaded lazily the first time it is needed.
+    Drop-in replacement for ``ConverterService``.
+    """
+
+    def __init__(
+        self,
+        vlm_service: Optional[ConverterService] = None,
+        text_service: Optional[ConverterService] = None,
+        min_chars: int = 100,
+        min_quality: float = 0.85,
+    ):
+        self.vlm_service = vlm_service or ConverterService()
+        self.text_service = text_service or ConverterService(
+            pipeline_options=default_text_pipeline_options(),
+            converter_factory=build_text_converter,
+        )
+        self.min_chars = min_chars
+        self.min_quality = min_quality
+
+    @property
+    def stats(self) -> ConverterStats:
+        cold_start_time = sum(
+            s.stats.cold_start_time or 0.0 for s in (self.text_service, self.vlm_service)
+        )
+        return ConverterStats(
+            cold_start_time=cold_start_time,
+            latencies=self.text_service.stats.latencies + self.vlm_service.stats.latencies,
+        )
+
+    def fingerprint(self) -> str:
+        parts = [self.text_service.fingerprint(), self.vlm_service.fingerprint(),
+                 str(self.min_chars), str(self.min_quality)]
+        return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
+    def warm_up(self) -> float:
+        # The VLM is only needed for scanned pages, so it is not loaded here
+        return self.text_service.warm_up()
+
+    def convert(self, source) -> ConvertedResume:
+        start_time = time.time()
+        routes = []
+        if Path(str(source)).suffix.lower() == ".pdf":
+            try:
+                routes = triage_pdf(str(source), self.min_chars, self.min_quality)
+            except Exception as e:
+                # pdfium could not open it (encrypted, corrupt): let the VLM have a go at the whole document
+                print(f"Triage failed for {source}, converting it with the VLM: {e!r}")
+        if not routes:
+            # Images, URLs and unreadable PDFs all go straight to the VLM
+            res = self.vlm_service.convert(source)
+            res.timings = [RouteTiming(VLM_ROUTE, 1, res.num_pages, res.latency)]
+            return res
+
+        runs = _group_runs(routes)
+        parts = []
+        timings = [RouteTiming(TRIAGE_STEP, 1, len(routes), time.time() - start_time)]
+        for route, start_page, end_page in runs:
+            service = self.text_service if route == TEXT_ROUTE else self.vlm_service
+            page_range = None if len(runs) == 1 else (start_page, end_page)
+            part = service.convert(source, page_range=page_range)
+            parts.append(part)
+            timings.append(RouteTiming(route, start_page, end_page, part.latency))
+
+        res = parts[0]
+        if len(parts) > 1:
+            res = ConvertedResume(
+                source=str(source),
+                stem=parts[0].stem,
+                document=None,
+                markdown="\n\n".join(part.markdown for part in parts),
+                num_pages=len(routes),
+                latency=0.0,
+            )
+        res.latency = time.time() - start_time
+        res.routes = routes
+        res.timings = timings
+        return res
+
+    def convert_many(self, sources) -> List[ConvertedResume]:
+        return [self.convert(source) for source in sources]
+
+
+_triaged: Optional[TriagedConverter] = None
+_triaged_lock = threading.Lock()
+
+
+def get_triaged_converter() -> TriagedConverter:
+    """Process-wide triaged converter sharing the default VLM service."""
+    global _triaged
+    with _triaged_lock:
+        if _triaged is None:
+            _triaged = TriagedConverter(vlm_service=get_converter_service())
+    return _triaged
@@ -0,0 +1,37 @@
+from resume_extract.candidate_store import CandidateStore, normalize_term
+
+
+def test_malformed_extraction_output_is_coerced_or_skipped(tmp_path):
+    store = CandidateStore(str(tmp_path / "candidates.sqlite"))
+    info = {
+        "skills": {"technical_skills": "Python, K8s; Triton", "tools_and_platforms": [{"name": "Docker"}, "Git"]},
+        "projects": {"title": "Inference server", "description": "Serves models with low latency",
+                     "technologies": ["TensorRT", None]},
+        "work_experience": [
+            "not a record",
+            {"company": "Acme", "title": "Engineer", "responsibilities": ["Built pipelines", "Ran on-call"],
+             "projects": [{"title": "Feature store", "technologies": "Redis"}]},
+        ],
+        "education": None,
+        "publications_research": "none",
+    }
+
+    store.upsert("candidate", info)
+
+    assert store.find_by_terms(["python", "kubernetes", "triton", "git"]) == ["candidate"]
+    assert store.find_by_terms(["tensorrt", "redis"], kinds=["technology"]) == ["candidate"]
+    assert store.find_by_terms(["docker"]) == []
+    assert [hit["candidate_key"] for hit in store.search("pipelines")] == ["candidate"]
+    assert [hit["candidate_key"] for hit in store.search("latency")] == ["candidate"]
+
+
+def test_bare_skill_list_counts_as_technical_skills(tmp_path):
+    store = CandidateStore(str(tmp_path / "candidates.sqlite"))
+    store.upsert("candidate", {"skills": ["Go", "PostgreSQL"]})
+
+    assert store.find_by_terms(["go", "postgresql"], kinds=["technical_skills"]) == ["candidate"]
+
+
+def test_tf_is_not_folded_into_tensorflow():
+    assert normalize_term("TF") == "tf"
+    assert normalize_term("K8s") == "kubernetes"
@@ -0,0 +1,44 @@
+from generate_question.dedup import LSHIndex, deduplicate_sections
+
+
+def _question(text):
+    return {"question": text, "category": "technical", "difficulty": "medium"}
+
+
+DUPLICATE = "How does a Kubernetes readiness probe differ from a liveness probe?"
+PLAN = [("projects", "Search", {"title": "Search"}, "projects", 1),
+        ("projects", "Billing", {"title": "Billing"}, "projects", 1),
+        ("projects", "Ingest", {"title": "Ingest"}, "projects", 1)]
+OUTCOMES = [([_question(DUPLICATE)], 0.1), ([_question(DUPLICATE)], 0.1), ([_question(DUPLICATE)], 0.1)]
+
+
+def test_replacements_of_a_round_are_requested_together():
+    rounds = []
+
+    def generate_many(requests):
+        rounds.append(requests)
+        return [[_question(f"What would you change first in the {data['title']} design?")]
+                for data, _, _ in requests]
+
+    def generate(*args):
+        raise AssertionError("generate_many should be used")
+
+    outcomes, stats = deduplicate_sections(PLAN, OUTCOMES, generate, LSHIndex(threshold=0.6),
+                                           generate_many=generate_many)
+
+    assert len(rounds) == 1
+    assert [(data["title"], data["avoid_questions"], n) for data, _, n in rounds[0]] == [
+        ("Billing", [DUPLICATE], 1), ("Ingest", [DUPLICATE], 1)]
+    assert [len(questions) for questions, _ in outcomes] == [1, 1, 1]
+    assert stats == {"duplicates": 2, "replacement_calls": 2, "replaced": 2}
+
+
+def test_sequential_replacements_match_the_batched_ones():
+    def generate(section_data, section_type, n):
+        return [_question(f"What would you change first in the {section_data['title']} design?")]
+
+    outcomes, stats = deduplicate_sections(PLAN, OUTCOMES, generate, LSHIndex(threshold=0.6))
+
+    assert [questions[-1]["question"] for questions, _ in outcomes[1:]] == [
+        "What would you change first in the Billing design?", "What would you change first in the Ingest design?"]
+    assert stats["replaced"] == 2
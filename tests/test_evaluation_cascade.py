@@ -0,0 +1,54 @@
+import numpy as np
+
+from evaluation.batch import evaluate_batch
+from evaluation.evaluate import AnswerEvaluator, CascadeStats, Question
+from evaluation.semantic import SemanticCoverageScorer
+
+POINTS = ["uses a hash map for constant time lookup", "handles collisions with chaining"]
+QUESTION = {"question_text": "How would you implement a symbol table?", "category": "technical",
+            "difficulty": "medium", "context": "", "expected_points": POINTS}
+# Says the same as POINTS without sharing their keywords
+PARAPHRASE = "I'd keep entries in a dictionary so finding one is O(1). Keys that clash go into a linked bucket."
+JUDGED = {"feedback": "Correct", "score": 0.9, "strengths": [], "areas_for_improvement": [],
+          "technical_depth": 0.8, "clarity": 0.9, "completeness": 0.9}
+
+
+def _concept_embed(texts):
+    """Toy embedder: one axis per concept, so paraphrases land on their point."""
+    concepts = [("hash", "dictionary"), ("collision", "clash")]
+    return np.array([[1.0 if any(word in text.lower() for word in words) else 0.0 for words in concepts] + [0.1]
+                     for text in texts])
+
+
+def test_low_keyword_coverage_escalates_to_the_judge(monkeypatch):
+    evaluator = AnswerEvaluator(Question(**QUESTION), cascade=True, stats=CascadeStats())
+    judged = []
+    monkeypatch.setattr(evaluator, "_get_llm_evaluation", lambda answer: judged.append(answer) or JUDGED)
+
+    result = evaluator.evaluate_answer(PARAPHRASE)
+
+    assert judged == [PARAPHRASE]
+    assert result.decided_by == "llm"
+    assert result.llm_score == 0.9
+
+
+def test_low_keyword_coverage_escalates_to_the_semantic_tier():
+    scorer = SemanticCoverageScorer(threshold=0.9, embed=_concept_embed)
+    evaluator = AnswerEvaluator(Question(**QUESTION), use_llm=False, cascade=True, semantic_scorer=scorer,
+                                stats=CascadeStats())
+
+    result = evaluator.evaluate_answer(PARAPHRASE)
+
+    assert result.decided_by == "semantic"
+    assert result.missing_points == []
+
+
+def test_batch_escalates_low_keyword_coverage():
+    scorer = SemanticCoverageScorer(threshold=0.9, embed=_concept_embed)
+    results = list(evaluate_batch([QUESTION], [[PARAPHRASE, "No idea."]], use_llm=False, cascade=True,
+                                  semantic_scorer=scorer))
+
+    by_answer = {result["answer_index"]: result for result in results}
+    assert by_answer[0]["decided_by"] == "semantic"
+    assert by_answer[0]["coverage_ratio"] == 1.0
+    assert by_answer[1]["coverage_ratio"] == 0.0
@@ -0,0 +1,51 @@
+from generate_question.question_bank import BankedPlan, QuestionBank
+
+
+def _question(text):
+    return {"question": text, "category": "technical", "difficulty": "medium", "context": None,
+            "expected_answer_points": []}
+
+
+def test_partly_banked_skills_section_still_generates_for_gaps(tmp_path):
+    bank = QuestionBank(str(tmp_path / "bank.sqlite"))
+    bank.add([_question("How does Python manage memory for long-running services?"),
+              _question("When would you reach for a Python generator over a list?"),
+              _question("What does the Python GIL prevent and what does it not?")], ["python"])
+    skills = {"technical_skills": ["Python", "TensorRT", "Triton", "Kubernetes"]}
+    plan = [("skills", "Technical Skills", skills, "skills", 3)]
+
+    banked = BankedPlan(plan, bank)
+
+    assert len(banked.llm_plan) == 1
+    _, _, data, _, num_questions = banked.llm_plan[0]
+    assert data == {"technical_skills": ["tensorrt", "triton", "kubernetes"]}
+    assert num_questions == 3
+    assert bank.stats()["requested"] == 3
+
+
+def test_gaps_fill_up_the_bank(tmp_path):
+    bank = QuestionBank(str(tmp_path / "bank.sqlite"))
+    bank.add([_question("Explain Python decorators with an example.")], ["python"])
+    plan = [("skills", "Technical Skills", {"technical_skills": ["Python", "Kubernetes"]}, "skills", 3)]
+
+    banked = BankedPlan(plan, bank)
+    _, _, data, _, num_questions = banked.llm_plan[0]
+    assert data == {"technical_skills": ["kubernetes"]}
+    assert num_questions == 2
+
+    outcomes = banked.merge([([_question("How does a Kubernetes readiness probe differ from a liveness probe?")],
+                              0.1)])
+    assert len(outcomes[0][0]) == 2
+    assert bank.missing(["python", "kubernetes"]) == []
+
+
+def test_fully_banked_section_skips_the_llm(tmp_path):
+    bank = QuestionBank(str(tmp_path / "bank.sqlite"))
+    bank.add([_question("Explain Python decorators with an example."),
+              _question("How do you profile a slow Python function?")], ["python"])
+    plan = [("skills", "Technical Skills", {"technical_skills": ["Python"]}, "skills", 2)]
+
+    banked = BankedPlan(plan, bank)
+
+    assert banked.llm_plan == []
+    assert len(banked.merge([])[0][0]) == 2
@@ -0,0 +1,43 @@
+from resume_extract.sectioner import NOT_FOUND, split_sections
+
+PLAIN_RESUME = """Jane Doe
+jane@example.com
+
+EXPERIENCE
+Acme Corp - Engineer
+Key Projects:
+- Built a thing
+
+EDUCATION
+BSc Computer Science, State University
+
+SKILLS
+Python, Go, Kubernetes
+"""
+
+
+def test_colon_label_inside_an_entry_stays_in_it():
+    sections, confidence = split_sections(PLAIN_RESUME)
+
+    assert "Key Projects:\n- Built a thing" in sections["work_experience:"]
+    assert sections["projects"] == f"Projects:\n{NOT_FOUND}"
+    assert confidence < 0.97
+
+
+def test_colon_label_starting_a_block_is_a_section():
+    text = PLAIN_RESUME.replace("Key Projects:\n- Built a thing", "") + "\nProjects:\n- Built a thing\n"
+
+    sections, confidence = split_sections(text)
+
+    assert sections["projects"] == "Projects:\n- Built a thing"
+    assert "Built a thing" not in sections["work_experience:"]
+    assert confidence > 0.9
+
+
+def test_markdown_sub_heading_stays_in_its_section():
+    text = "# Jane Doe\n\n## Experience\n\n### Acme Corp\n\n#### Key Projects\n\n- Built a thing\n\n## Skills\n\nPython\n"
+
+    sections, _ = split_sections(text)
+
+    assert "Built a thing" in sections["work_experience:"]
+    assert sections["projects"] == f"Projects:\n{NOT_FOUND}"